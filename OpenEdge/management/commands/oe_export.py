@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Exports the table of a model to CSV or JSON lines, see OpenEdge.pyodbc.export.
+'''
+
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import get_model
+
+from OpenEdge.pyodbc.export import Exporter, FORMATS
+
+
+class Command(BaseCommand):
+    args = '<app_label.ModelName> <output file>'
+    help = 'Exports the OpenEdge table of a model by key ranges read at the same time.'
+
+    option_list = BaseCommand.option_list + (
+        make_option('--database', action='store', dest='database', default=DEFAULT_DB_ALIAS,
+                    help='Database to export from. Defaults to the "default" database.'),
+        make_option('--format', action='store', dest='format', default='csv',
+                    help='Output format: %s (csv by default).' % ', '.join(FORMATS)),
+        make_option('--partitions', action='store', type='int', dest='partitions', default=4,
+                    help='Number of key ranges read at the same time (4 by default).'),
+        make_option('--key', action='store', dest='key', default=None,
+                    help='Field splitting the table, found in the catalog indexes by default.'),
+        make_option('--fields', action='store', dest='fields', default='',
+                    help='Fields exported, separated by commas. Defaults to all the fields.'),
+        make_option('--split', action='store_true', dest='split', default=False,
+                    help='Writes each range to its own file (name-1.csv, ...) instead of one ordered file.'),
+        make_option('--chunk-size', action='store', type='int', dest='chunk_size', default=1000,
+                    help='Rows read by query (1000 by default).'),
+    )
+
+    def handle(self, *args, **options):
+        if len(args) != 2:
+            raise CommandError('Usage: oe_export %s' % self.args)
+        label, path = args
+        try:
+            app_label, model_name = label.split('.')
+        except ValueError:
+            raise CommandError('The model must be given as app_label.ModelName, not %s' % label)
+        model = get_model(app_label, model_name)
+        if model is None:
+            raise CommandError('Unknown model: %s' % label)
+        if options.get('format') not in FORMATS:
+            raise CommandError('Unknown format %s, use one of: %s' % (options.get('format'), ', '.join(FORMATS)))
+
+        fields = [name.strip() for name in options.get('fields').split(',') if name.strip()]
+        verbosity = int(options.get('verbosity', 1))
+        chunk_size = options.get('chunk_size')
+
+        def progress(rows):
+            if verbosity > 1 and rows // chunk_size % 100 == 0:
+                self.stdout.write('%d rows' % rows)
+
+        exporter = Exporter(model._default_manager.using(options.get('database')), path,
+                            format=options.get('format'), partitions=options.get('partitions'),
+                            key=options.get('key'), fields=fields or None, split=options.get('split'),
+                            chunk_size=chunk_size, progress=progress)
+        report = exporter.export()
+
+        self.stdout.write('%d rows in %.2fs, %d rows/s: %s' % (
+            report['rows'], report['seconds'], report['rows_per_second'], ', '.join(report['paths'])))
+        if verbosity > 1:
+            for i, r in enumerate(report['ranges']):
+                self.stdout.write('  %r: %d rows in %.2fs' % (r['partition'], r['rows'], r['seconds']))
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Loads a CSV file in the table of a model, see OpenEdge.pyodbc.loader.
+'''
+
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import get_model
+
+from OpenEdge.pyodbc.loader import CsvLoader, LoadError
+
+
+class Command(BaseCommand):
+    args = '<app_label.ModelName> <file.csv>'
+    help = 'Loads a CSV file in the OpenEdge table of a model with several worker connections.'
+
+    option_list = BaseCommand.option_list + (
+        make_option('--database', action='store', dest='database', default=DEFAULT_DB_ALIAS,
+                    help='Database to load. Defaults to the "default" database.'),
+        make_option('--workers', action='store', type='int', dest='workers', default=4,
+                    help='Number of worker connections (4 by default).'),
+        make_option('--batch-size', action='store', type='int', dest='batch_size', default=1000,
+                    help='Rows sent by statement (1000 by default).'),
+        make_option('--delimiter', action='store', dest='delimiter', default=',',
+                    help='Field delimiter of the file ("," by default).'),
+        make_option('--encoding', action='store', dest='encoding', default='utf-8',
+                    help='Encoding of the file (utf-8 by default).'),
+        make_option('--columns', action='store', dest='columns', default='',
+                    help='Columns of the file mapped to other field names: "col=field,other=". '
+                         'A column mapped to nothing is ignored.'),
+        make_option('--no-fast-executemany', action='store_false', dest='fast_executemany', default=True,
+                    help='Sends the rows without the array binding of pyodbc.'),
+        make_option('--drop-indexes', action='store_true', dest='drop_indexes', default=False,
+                    help='Drops the non-unique indexes of the table during the load.'),
+        make_option('--dry-run', action='store_true', dest='dry_run', default=False,
+                    help='Reads and converts the file without writing to the database.'),
+    )
+
+    def handle(self, *args, **options):
+        if len(args) != 2:
+            raise CommandError('Usage: oe_loadcsv %s' % self.args)
+        label, path = args
+        try:
+            app_label, model_name = label.split('.')
+        except ValueError:
+            raise CommandError('The model must be given as app_label.ModelName, not %s' % label)
+        model = get_model(app_label, model_name)
+        if model is None:
+            raise CommandError('Unknown model: %s' % label)
+
+        columns = {}
+        for item in options.get('columns').split(','):
+            if item.strip():
+                name, _, field = item.partition('=')
+                columns[name.strip()] = field.strip()
+
+        verbosity = int(options.get('verbosity', 1))
+        batch_size = options.get('batch_size')
+
+        def progress(rows):
+            if verbosity > 1 and rows // batch_size % 100 == 0:
+                self.stdout.write('%d rows' % rows)
+
+        try:
+            loader = CsvLoader(model, path, using=options.get('database'), workers=options.get('workers'),
+                               batch_size=batch_size, columns=columns,
+                               delimiter=options.get('delimiter'), encoding=options.get('encoding'),
+                               fast_executemany=options.get('fast_executemany'),
+                               drop_indexes=options.get('drop_indexes'), progress=progress)
+            report = loader.load(dry_run=options.get('dry_run'))
+        except LoadError, e:
+            raise CommandError(str(e))
+
+        self.stdout.write('%s%d rows in %.2fs, %d rows/s, %d statements, %d errors' % (
+            options.get('dry_run') and 'Dry run: ' or '', report['rows'], report['seconds'],
+            report['rows_per_second'], report['statements'], report['errors']))
+        if verbosity > 1:
+            for i, r in enumerate(report['ranges']):
+                self.stdout.write('  range %d: bytes %d-%d, %d rows in %.2fs' % (
+                    i + 1, r['start'], r['end'], r['rows'], r['seconds']))
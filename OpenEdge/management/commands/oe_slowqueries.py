@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Prints the top offenders of the OpenEdge slow query log, by total time.
+'''
+
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, DEFAULT_DB_ALIAS
+
+from OpenEdge.pyodbc.slowlog import slow_query_log_options, read_log, summarize
+
+
+class Command(BaseCommand):
+    help = 'Prints the statements of the OpenEdge slow query log with the highest total time.'
+
+    option_list = BaseCommand.option_list + (
+        make_option('--database', action='store', dest='database', default=DEFAULT_DB_ALIAS,
+                    help='Database whose SLOW_QUERY_LOG is read. Defaults to the "default" database.'),
+        make_option('--file', action='store', dest='file', default=None,
+                    help='Slow query log file, instead of the PATH of the database settings.'),
+        make_option('--limit', action='store', type='int', dest='limit', default=10,
+                    help='Number of statements printed (10 by default).'),
+    )
+
+    def handle(self, **options):
+        path = options.get('file')
+        if path is None:
+            settings_dict = connections[options.get('database')].settings_dict
+            log_options = slow_query_log_options(settings_dict)
+            if log_options is None:
+                raise CommandError('The database %s has no SLOW_QUERY_LOG' % options.get('database'))
+            path = log_options['PATH']
+
+        top = summarize(read_log(path))[:options.get('limit')]
+        if not top:
+            self.stdout.write('No slow statement in %s' % path)
+            return
+
+        for rank, st in enumerate(top):
+            self.stdout.write('%d. total %.3fs  count %d  mean %.3fs  max %.3fs' % (
+                rank + 1, st['total_time'], st['count'], st['total_time'] / st['count'], st['max_time']))
+            self.stdout.write('   %s' % st['fingerprint'])
+            if st['sample']:
+                self.stdout.write('   params: %r' % (st['sample'],))
+            for caller, count in st['callers'].most_common(3):
+                if caller:
+                    self.stdout.write('   %d x %s' % (count, caller))
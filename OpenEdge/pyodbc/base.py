@@ -43,6 +43,7 @@ if pyodbc_ver < (2, 0, 38, 9999):
     raise ImproperlyConfigured("pyodbc 2.0.38 or newer is required; you have %s" % Database.version)
 
 from django.db.backends import BaseDatabaseWrapper, BaseDatabaseFeatures, BaseDatabaseValidation
+from django.db.backends import util
 from django.db.backends.signals import connection_created
 from django.db.transaction import TransactionManagementError
 from django.utils.functional import cached_property
@@ -77,11 +78,26 @@ from OpenEdge.pyodbc.operations import DatabaseOperations
 from OpenEdge.pyodbc.client import DatabaseClient
 from OpenEdge.pyodbc.creation import DatabaseCreation
 from OpenEdge.pyodbc.introspection import DatabaseIntrospection
+from OpenEdge.pyodbc.session import SessionConfig, SessionState, session_signature
+from OpenEdge.pyodbc.pool import get_pool
+from OpenEdge.pyodbc.cache import get_cache
+from OpenEdge.pyodbc.encoding import ParamEncoder, row_decoder, input_sizes
+from OpenEdge.pyodbc.statements import classify_sql, SELECT, INSERT, UPDATE, DELETE, CREATE_TABLE, ALTER_TABLE, DDL_KINDS
+from OpenEdge.pyodbc.instrumentation import get_instrument
+from OpenEdge.pyodbc.catalog import get_catalog, invalidate_catalog
+from OpenEdge.pyodbc.sequences import invalidate_allocators
+from OpenEdge.pyodbc.bulkload import BulkLoad
+from OpenEdge.pyodbc.streaming import slices
+import logging
 import os
+import time
 import warnings
 
 warnings.filterwarnings('error', 'The DATABASE_ODBC.+ is deprecated', DeprecationWarning, __name__, 0)
 
+# The failed statements are logged with their parameters
+logger = logging.getLogger('OpenEdge.pyodbc')
+
 
 #===============================================================================
 # collation = 'Latin1_General_CI_AS'
@@ -99,6 +115,21 @@ for old, new in deprecated:
             DeprecationWarning
         )
 
+#===============================================================================
+# DDL rewriting patterns, by statement kind : (table name, statement prefix)
+#===============================================================================
+TABLE_DDL_PATTERNS = {
+    CREATE_TABLE: (re.compile(r'CREATE TABLE "(?P<TName>\w+)"'), re.compile(r'CREATE TABLE "\w+"')),
+    ALTER_TABLE: (re.compile(r'ALTER TABLE "(?P<TName>\w+)"'), re.compile(r'ALTER TABLE "\w+"')),
+}
+UNIQUE_CLAUSE = re.compile(r'(?P<uniqueClause>UNIQUE *\(.*\))')
+UNIQUE_FIELDS = re.compile(r'("\w+"[, ]*)+')
+UNIQUE_CLAUSE_STRIP = re.compile(r'(?P<uniqueClause>, *UNIQUE *\(".*"\))')
+
+# SQLSTATE of a driver without array binding : optional feature not implemented,
+# invalid attribute identifier, driver does not support this function
+FAST_EXECUTEMANY_UNSUPPORTED = ('HYC00', 'HY092', 'IM001')
+
 DatabaseError = Database.DatabaseError
 IntegrityError = Database.IntegrityError
 
@@ -190,6 +221,29 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         else:
             self.features = DatabaseFeatures()
         self.ops = DatabaseOperations(self)
+
+        #=======================================================================
+        # Commit policy of the statements :
+        #     AUTOCOMMIT : use the ODBC autocommit outside of managed transactions
+        #     COMMIT_MODE : 'transaction' leaves the commits to Django
+        #                   (commit_unless_managed() or the end of a managed
+        #                   transaction), 'statement' commits after every
+        #                   statement (behaviour of the previous versions)
+        #=======================================================================
+        self.features.uses_autocommit = self.settings_dict.get('AUTOCOMMIT', False)
+        self.commit_mode = self.settings_dict.get('COMMIT_MODE', 'transaction')
+        self.transaction_stats = {'commits': 0, 'skipped_commits': 0}
+
+        #=======================================================================
+        # LRU cache of the driver-ready statements, STATEMENT_CACHE_SIZE = 0
+        # disables it
+        #=======================================================================
+        self._param_encoder = None
+        self.statement_cache = get_cache('statements', getattr(self, 'alias', 'default'),
+                                         self.settings_dict.get('STATEMENT_CACHE_SIZE', 500))
+        # SQL of the queries by structure, see SQLCompiler.as_sql. Cleared by the DDL
+        self.compiled_cache = get_cache('compiled', getattr(self, 'alias', 'default'),
+                                        self.settings_dict.get('COMPILED_CACHE_SIZE', 500))
         
         #=======================================================================
         # self.MAX_TABLE_NAME=self.ops.max_name_length()
@@ -209,110 +263,246 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         self.connection = None
         self.owner = None
 
-    def _cursor(self):
-        new_conn = False
-        settings_dict = self.settings_dict
+        # Session state, see OpenEdge.pyodbc.session
+        self._session_config = None
+        self.session = None
+        self.session_stats = {'bootstraps': 0, 'skipped_round_trips': 0}
+
+        # Connection pool, see OpenEdge.pyodbc.pool
+        self.pool = None
+        self._pool_entry = None
+
         #=======================================================================
-        # DSN=eslemien;HOST=localhost;DB=eslemien;UID=jyp;PWD=jyp;PORT=50000
+        # Streaming reads, see OpenEdge.pyodbc.streaming
         #=======================================================================
-        db_str, user_str, passwd_str, port_str = None, None, "", None
-        dual_str='DUAL'
-        
-        # Get OpenEdge internal Db Codepage (default iso8859-1) 
-        if settings_dict.has_key('CPINTERNAL'):
-            self.oecpinternal = settings_dict['CPINTERNAL']
-            
-        if settings_dict.has_key('TYPECNX'):
-            if settings_dict['TYPECNX'].has_key('DSN'):
-                #===================================================================
-                # DSN
-                #===================================================================
-                
-                typecnx_str = 'DSN=%s'%settings_dict['TYPECNX']['DSN']
+        self.features.can_use_chunked_reads = self.settings_dict.get('CHUNKED_READS', False)
+        # Defaults to django GET_ITERATOR_CHUNK_SIZE
+        self.chunk_size = self.settings_dict.get('CHUNK_SIZE', 100)
+        # Blocks read ahead by a worker thread, 0 disables the read-ahead
+        self.prefetch = self.settings_dict.get('PREFETCH', 0)
+        # Idle dedicated connections of the streaming reads (without pool)
+        self._stream_connections = []
+
+        # Array binding of executemany (pyodbc fast_executemany), see CursorWrapper._executemany
+        self.fast_executemany = self.settings_dict.get('FAST_EXECUTEMANY', False)
+        # Running bulk load, see OpenEdge.pyodbc.bulkload
+        self.bulk_loader = None
+
+        # Statement instrument, None when disabled, see OpenEdge.pyodbc.instrumentation
+        self.instrument = get_instrument(getattr(self, 'alias', 'default'), self.settings_dict)
+
+    def get_session_config(self):
+        """
+        Returns the SessionConfig of this connection, it is only rebuilt when
+        the settings_dict changes.
+        """
+        if self._session_config is None or self._session_config.signature != session_signature(self.settings_dict):
+            self._session_config = SessionConfig(self.settings_dict, _DJANGO_VERSION)
+        return self._session_config
 
-            elif settings_dict['TYPECNX'].has_key('DRIVER'):
-                #===================================================================
-                # DRIVER
-                #===================================================================
-                typecnx_str = 'DRIVER={%s}'%settings_dict['TYPECNX']['DRIVER']        
-        
-            
-        #===================================================================
-        # DUAL TABLE
-        #===================================================================
-        if settings_dict.has_key('DUALTABLE'):
-            dual_str = settings_dict['DUALTABLE']
-                
-        #===================================================================
-        # Default Schema
-        #===================================================================
-        if settings_dict['DEFAULTSCHEMA']:
-            defschema_str = settings_dict['DEFAULTSCHEMA']
-        else:
-            defschema_str = settings_dict['USER']
-                
-                
-        if _DJANGO_VERSION >= 12:
-            options = settings_dict['OPTIONS']
-            if settings_dict['NAME']:
-                db_str = settings_dict['NAME']
-                
-            if settings_dict['HOST']:
-                host_str = settings_dict['HOST']
-            else:
-                host_str = 'localhost'
-            if settings_dict['USER']:
-                user_str = settings_dict['USER']
-                
-                
-            if settings_dict['PASSWORD']:
-                passwd_str = settings_dict['PASSWORD']
-            if settings_dict['PORT']:
-                port_str = settings_dict['PORT']
-            
-            self.introspection.uid = defschema_str
-            self.owner = defschema_str
+    def get_param_encoder(self):
+        """
+        Returns the ParamEncoder of the current codepage, shared by the cursors.
+        """
+        if self._param_encoder is None or self._param_encoder.oecpinternal != self.oecpinternal:
+            self._param_encoder = ParamEncoder(self.driver_needs_utf8, self.oecpinternal)
+        return self._param_encoder
+
+    def _bootstrap_session(self, config, connection=None, session=None):
+        """
+        Sets the default schema of the physical connection and creates the DUAL
+        table if it does not exist.
+        """
+        if connection is None:
+            connection, session = self.connection, self.session
+        cursor = connection.cursor()
+        cursor.execute("SET SCHEMA '%s'"%config.defschema)
+        connection.commit()
+        if len(cursor.execute("SELECT * FROM SYSPROGRESS.SYSTABLEs WHERE OWNER = '%s' AND TBL = '%s'"%(config.defschema,config.dual)).fetchall()) == 0 :
+            cursor.execute('CREATE TABLE "%s"."%s" (SEQACCESS integer)'%(config.defschema,config.dual))
+            connection.commit()
+            cursor.execute('INSERT INTO "%s"."%s" VALUES (1)'%(config.defschema,config.dual))
+            connection.commit()
+        #=======================================================================
+        # The catalog of the schema is read once per process, see OpenEdge.pyodbc.catalog
+        #=======================================================================
+        if self.settings_dict.get('CATALOG_WARMUP', True):
+            catalog = get_catalog(getattr(self, 'alias', 'default'), config.defschema)
+            if not catalog.warm:
+                catalog.warmup(cursor)
+        session.set_ready(config)
+        self.session_stats['bootstraps'] += 1
+
+    def _get_pool(self, config):
+        connstr = config.connstr
+        return get_pool(getattr(self, 'alias', 'default'), connstr, self.settings_dict['POOL'],
+                        lambda: Database.connect(connstr),
+                        'SELECT SEQACCESS FROM "%s"."%s"'%(config.defschema,config.dual))
+
+    def chunked_cursor(self):
+        """
+        Returns a cursor for a streaming read. When the connection has no
+        pending changes, the read runs on a dedicated physical connection, so
+        the commits of the other queries do not close its result set. The
+        dedicated connection is released when the cursor is closed.
+
+        With POOL, the dedicated connection is taken from the pool only when
+        one is free, the read runs on the connection of the thread otherwise.
+        connection_created is sent for a new dedicated connection.
+        """
+        if self._dirty or not self.settings_dict.get('STREAM_CONNECTION', True):
+            return self.cursor()
+
+        config = self.get_session_config()
+        self.oecpinternal = config.cpinternal
+        if self.settings_dict.get('POOL'):
+            pool = self._get_pool(config)
+            entry = pool.checkout(wait=False)
+            if entry is None:
+                return self.cursor()
+            connection, session = entry.connection, entry.session
+            created = entry.uses == 1
+            release = lambda: pool.checkin(entry)
         else:
-            options = settings_dict['DATABASE_OPTIONS']
-                            
-            if settings_dict['DATABASE_NAME']:
-                db_str = settings_dict['DATABASE_NAME']
-            if settings_dict['DATABASE_HOST']:
-                host_str = settings_dict['DATABASE_HOST']
+            created = not self._stream_connections
+            if created:
+                connection, session = Database.connect(config.connstr), SessionState()
             else:
-                host_str = 'localhost'
-            if settings_dict['DATABASE_USER']:
-                user_str = settings_dict['DATABASE_USER']
-            if settings_dict['DATABASE_PASSWORD']:
-                passwd_str = settings_dict['DATABASE_PASSWORD']
-            if settings_dict['DATABASE_PORT']:
-                port_str = settings_dict['DATABASE_PORT']
+                connection, session = self._stream_connections.pop()
+
+            def release():
+                # The read transaction is ended before the connection is reused
+                try:
+                    connection.rollback()
+                except Database.Error:
+                    try:
+                        connection.close()
+                    except Database.Error:
+                        pass
+                else:
+                    self._stream_connections.append((connection, session))
+
+        if created:
+            self._send_created(connection, session)
+        if not session.is_ready(config):
+            self._bootstrap_session(config, connection, session)
+
+        cursor = CursorWrapper(connection.cursor(), self.driver_needs_utf8, self.oecpinternal,config.defschema,self.ops,self.creation)
+        cursor.on_close = release
+        if self.use_debug_cursor or (self.use_debug_cursor is None and settings.DEBUG):
+            return self.make_debug_cursor(cursor)
+        return util.CursorWrapper(cursor, self)
+
+    def _send_created(self, connection, session):
+        """
+        Sends connection_created for a dedicated connection, which is the
+        connection of the wrapper while the receivers run.
+        """
+        saved = self.connection, self.session
+        self.connection, self.session = connection, session
+        try:
+            connection_created.send(sender=self.__class__, connection=self)
+        finally:
+            self.connection, self.session = saved
+
+    def close(self):
+        """
+        Returns a pooled connection to its pool instead of closing it.
+        """
+        while self._stream_connections:
+            connection, session = self._stream_connections.pop()
+            connection.close()
+        if self._pool_entry is None:
+            return super(DatabaseWrapper, self).close()
+        if hasattr(self, 'validate_thread_sharing'):
+            self.validate_thread_sharing()
+        entry, self._pool_entry = self._pool_entry, None
+        self.connection = None
+        self.session = None
+        self.pool.checkin(entry)
+
+    def forget_connection(self):
+        """
+        Forgets the physical connections without closing them, ie: in a child
+        process, where they belong to the parent.
+        """
+        self.connection = None
+        self.session = None
+        self._pool_entry = None
+        self._stream_connections = []
+
+    def _cursor(self):
+        config = self.get_session_config()
+        self.oecpinternal = config.cpinternal
+
+        if _DJANGO_VERSION >= 12:
+            self.introspection.uid = config.defschema
+            self.owner = config.defschema
+
         if self.connection is None:
-            new_conn = True
-            if not db_str:
+            if not config.db_name:
                 from django.core.exceptions import ImproperlyConfigured
                 raise ImproperlyConfigured('You need to specify NAME in your Django settings file.')
 
-            
-            connstr='%s;HOST=%s;DB=%s;UID=%s;PWD=%s;PORT=%s'%(typecnx_str,host_str,db_str,user_str,passwd_str,port_str)
-            
-            #import pdb; pdb.set_trace()
-            self.connection = Database.connect(connstr)
-            connection_created.send(sender=self.__class__)
+            if self.settings_dict.get('POOL'):
+                #===============================================================
+                # Check out a connection of the pool, the signal is only sent
+                # for a new physical connection
+                #===============================================================
+                self.pool = self._get_pool(config)
+                self._pool_entry = self.pool.checkout()
+                self.connection = self._pool_entry.connection
+                self.session = self._pool_entry.session
+                if self._pool_entry.uses == 1:
+                    connection_created.send(sender=self.__class__, connection=self)
+            else:
+                self.connection = Database.connect(config.connstr)
+                self.session = SessionState()
+                connection_created.send(sender=self.__class__, connection=self)
 
         #=======================================================================
-        # Set default schema
+        # Set default schema, only once per physical connection
         #=======================================================================
+        if self.session.is_ready(config):
+            self.session_stats['skipped_round_trips'] += SessionState.BOOTSTRAP_ROUND_TRIPS
+        else:
+            self._bootstrap_session(config)
+
+        if self.features.uses_autocommit:
+            autocommit = not self.is_managed()
+            if self.connection.autocommit != autocommit:
+                self.connection.autocommit = autocommit
+
         cursor = self.connection.cursor()
-        cursor.execute("SET SCHEMA '%s'"%defschema_str)
-        self.connection.commit()
-        if len(cursor.execute("SELECT * FROM SYSPROGRESS.SYSTABLEs WHERE OWNER = '%s' AND TBL = '%s'"%(defschema_str,dual_str)).fetchall()) == 0 :        
-            cursor.execute('CREATE TABLE "%s"."%s" (SEQACCESS integer)'%(defschema_str,dual_str))
-            self.connection.commit()
-            cursor.execute('INSERT INTO "%s"."%s" VALUES (1)'%(defschema_str,dual_str))
-            self.connection.commit()
-        
-        return CursorWrapper(cursor, self.driver_needs_utf8, self.oecpinternal,defschema_str,self.ops,self.creation)
+        return CursorWrapper(cursor, self.driver_needs_utf8, self.oecpinternal,config.defschema,self.ops,self.creation)
+
+    def bulk_load(self, *tables, **options):
+        """
+        Returns a bulk load context manager of the tables (models or table
+        names), see OpenEdge.pyodbc.bulkload.
+        """
+        return BulkLoad(self, tables, **options)
+
+    def _commit(self):
+        """
+        With the ODBC autocommit, the driver already committed the statements.
+        """
+        if self.connection is not None and not self.connection.autocommit:
+            return self.connection.commit()
+
+    def _enter_transaction_management(self, managed):
+        """
+        Switches the ODBC autocommit off for a managed transaction.
+        """
+        if self.features.uses_autocommit and managed and self.connection is not None and self.connection.autocommit:
+            self.connection.autocommit = False
+
+    def _leave_transaction_management(self, managed):
+        """
+        Switches the ODBC autocommit back on when leaving a managed transaction.
+        """
+        if self.features.uses_autocommit and not managed and self.connection is not None and not self.connection.autocommit:
+            self.connection.autocommit = True
 
     ################# 20131007 #############################
     def leave_transaction_management(self):
@@ -357,6 +547,14 @@ class DatabaseWrapper(BaseDatabaseWrapper):
             return self.transaction_state[-1]
         return settings.TRANSACTIONS_MANAGED
     
+def transcoded_bytes(values):
+    """
+    Returns the length of the character values of a row, counted by the
+    instruments as transcoded bytes.
+    """
+    return sum([len(v) for v in values if isinstance(v, basestring)])
+
+
 class CursorWrapper(object):
     """
     A wrapper around the pyodbc's cursor that takes in account a) some pyodbc
@@ -377,6 +575,13 @@ class CursorWrapper(object):
         
         self.creation = creation
         self.ops = ops
+        self.db = ops.connection
+        self.statement_cache = self.db.statement_cache
+        self.encoder = self.db.get_param_encoder()
+        self._row_decoder = None
+        # Called by close(), ie: to release a dedicated connection
+        self.on_close = None
+        self.instrument = self.db.instrument
 
     def format_sql(self, sql, n_params=None):
         if self.driver_needs_utf8 and isinstance(sql, unicode):            
@@ -391,38 +596,71 @@ class CursorWrapper(object):
         return sql
 
     def format_params(self, params):
-        
-        #import pdb; pdb.set_trace()
-        
-        fp = []
-        
-        for p in params:
-            if isinstance(p, unicode):
-                if self.driver_needs_utf8:                    
-                    fp.append(p.encode('utf-8'))
-                else:
-                    fp.append(p)
-            elif isinstance(p, str):
-                if self.driver_needs_utf8:
-                    fp.append(p.decode(self.oecpinternal).encode('utf-8'))
-                else:
-                    fp.append(p)
-            elif isinstance(p, type(True)):
-                if p:
-                    fp.append(1)
-                else:
-                    fp.append(0)
-            else:
-                fp.append(p)
-        return tuple(fp)
+        """
+        Encodes the parameters for the driver, see OpenEdge.pyodbc.encoding.
+        """
+        return self.encoder.encode(params)
 
     def execute(self, sql, params=()):
         #import pdb; pdb.set_trace()
         #print '>>> Execute ',sql
-        self.last_sql = sql        
-        sql = self.format_sql(sql, len(params))
+        self.last_sql = sql
+        instrument = self.instrument
+        if instrument is not None:
+            start = time.time()
+
+        #=======================================================================
+        # The ORM repeats the same statements, their driver-ready SQL is cached
+        #=======================================================================
+        key = (sql, len(params))
+        prepared = self.statement_cache.get(key)
+        if prepared is None:
+            prepared = self.prepare_sql(sql, len(params))
+            self.statement_cache.put(key, prepared)
+        sql, followUps, kind = prepared
+        self._row_decoder = None
+
         params = self.format_params(params)
         self.last_params = params
+        if instrument is not None:
+            sent = time.time()
+
+        #import pdb; pdb.set_trace()
+        #print 'OpenEdge Base %s  ::: values : %s ::: Sequence : %s ::: Unique Index : %s ' % (sql,params,idSequence,sqlUniqueIndex)
+        failed = True
+        try:
+            try:
+                rcode=self.cursor.execute(sql,params)
+                failed = False
+            finally:
+                if instrument is not None:
+                    # The driver time is the time of the statement only
+                    instrument.record(self.last_sql, 'execute', params, 0, time.time() - sent, sent - start,
+                                      transcoded_bytes(params), error=failed)
+        except  Exception as e:            
+            #print 'OpenEdge Base %s  ::: values : %s ::: Sequence : %s ::: Unique Index : %s ' % (sql,params,idSequence,sqlUniqueIndex)
+            logger.error('Statement failed: %s ::: values : %s ::: Unique Index : %s', sql, params, followUps)
+            raise Database.DatabaseError(e)
+
+        for followUp in followUps:
+            self.cursor.execute(followUp)
+        if kind in DDL_KINDS:
+            # The compiled queries and the catalog may refer to the old schema
+            self.db.compiled_cache.clear()
+            invalidate_catalog(getattr(self.db, 'alias', 'default'), self.last_sql)
+            invalidate_allocators(getattr(self.db, 'alias', 'default'), self.last_sql)
+        self._end_statement(kind)
+        if self.db.bulk_loader is not None and kind in (INSERT, UPDATE, DELETE):
+            self.db.bulk_loader.written(max(self.cursor.rowcount, 1))
+        #import pdb; pdb.set_trace()
+        return rcode
+
+    def prepare_sql(self, sql, n_params):
+        """
+        Returns the driver-ready SQL of a statement, the statements to
+        execute after it (ie: the unique index of a CREATE TABLE) and its kind.
+        """
+        sql = self.format_sql(sql, n_params)
         
         #=======================================================================
         # OpenEdge no ; at the end
@@ -434,30 +672,30 @@ class CursorWrapper(object):
         sqlUniqueIndex=None
         idSequence=None
         sql=sql.replace('\n','')
-        
-        if re.search('CREATE TABLE ',sql) is not None or re.search('ALTER TABLE ',sql) is not None:
-            
-            if re.search('CREATE TABLE ',sql) is not None :
-                Statement='CREATE TABLE "'
-            elif re.search('ALTER TABLE ',sql) is not None :
-                Statement='ALTER TABLE "'
-            
-            motif='%s(?P<TName>\w+)"'%Statement    
-            tn=re.search(motif, sql)
-            if tn is not None:
-                OETblName=tn.group('TName')[:self.MAX_TABLE_NAME]                
+
+        #=======================================================================
+        # Only the CREATE TABLE and ALTER TABLE are rewritten
+        #=======================================================================
+        kind = classify_sql(sql)
+        tn = None
+        if kind in TABLE_DDL_PATTERNS:
+            Statement = kind + ' "'
+            tablePattern, statementPattern = TABLE_DDL_PATTERNS[kind]
+            tn=tablePattern.search(sql)
+
+        if tn is not None:
+            OETblName=tn.group('TName')[:self.MAX_TABLE_NAME]                
             
-            motif='%s\w+"'%Statement
-            sql=re.sub(motif,'', sql)
-            if Statement == 'CREATE TABLE "':
-                uniqueKw=re.search('(?P<uniqueClause>UNIQUE *\(.*\))', sql)
+            sql=statementPattern.sub('', sql)
+            if kind == CREATE_TABLE:
+                uniqueKw=UNIQUE_CLAUSE.search(sql)
                 if uniqueKw is not None:
                     
-                    fidx=re.search('("\w+"[, ]*)+',uniqueKw.group('uniqueClause'))                    
+                    fidx=UNIQUE_FIELDS.search(uniqueKw.group('uniqueClause'))                    
                     FieldIdx=fidx.group().split(',')
                     indexName=self.ops.create_index_name(OETblName, FieldIdx, self.creation,self.MAX_INDEX_NAME,suffix="")                    
                     cols = ", ".join(FieldIdx)                    
-                    sql=re.sub('(?P<uniqueClause>, *UNIQUE *\(".*"\))','', sql)
+                    sql=UNIQUE_CLAUSE_STRIP.sub('', sql)
                     sqlUniqueIndex='CREATE UNIQUE INDEX %s ON "%s" (%s)'%(indexName,OETblName,cols)
                     
                     #=====================Old method ======================================
@@ -550,23 +788,30 @@ class CursorWrapper(object):
         #=======================================================================
                 
                 
-        #import pdb; pdb.set_trace()
-        #print 'OpenEdge Base %s  ::: values : %s ::: Sequence : %s ::: Unique Index : %s ' % (sql,params,idSequence,sqlUniqueIndex)
-        try:
-            rcode=self.cursor.execute(sql,params)
-        except  Exception as e:            
-            #print 'OpenEdge Base %s  ::: values : %s ::: Sequence : %s ::: Unique Index : %s ' % (sql,params,idSequence,sqlUniqueIndex)
-            print 'OpenEdge Base %s  ::: values : %s :::  Unique Index : %s ' % (sql,params,sqlUniqueIndex)
-            raise Database.DatabaseError(e)
-                
-        
         if sqlUniqueIndex is not None:
-            self.cursor.execute(sqlUniqueIndex)
+            return sql, (sqlUniqueIndex,), kind
+        return sql, (), kind
+
+    def _end_statement(self, kind):
+        """
+        Commits a statement in the 'statement' COMMIT_MODE only : otherwise the
+        commit is done by Django, at the end of a managed transaction or by
+        commit_unless_managed() after a write, or by the driver with the ODBC
+        autocommit.
+        """
+        db = self.db
+        if db.commit_mode != 'statement':
+            db.transaction_stats['skipped_commits'] += 1
+            return
         self.connection.commit()
-        #import pdb; pdb.set_trace()
-        return rcode
+        db.transaction_stats['commits'] += 1
     
     def executemany(self, sql, params_list):
+        self._row_decoder = None
+        self.last_sql = sql
+        instrument = self.instrument
+        if instrument is not None:
+            start = time.time()
         sql = self.format_sql(sql)
         # pyodbc's cursor.executemany() doesn't support an empty param_list
         if not params_list:
@@ -574,40 +819,135 @@ class CursorWrapper(object):
                 return
         else:
             raw_pll = params_list
-            params_list = [self.format_params(p) for p in raw_pll]
+            params_list = self.encoder.encode_many(raw_pll)
         
-        print '>>>',sql            
+        if instrument is not None:
+            sent = time.time()
+        failed = True
+        try:
+            try:
+                rcode = self._executemany(sql, params_list)
+                failed = False
+            finally:
+                if instrument is not None:
+                    instrument.record(self.last_sql, 'executemany', params_list, len(params_list),
+                                      time.time() - sent, sent - start,
+                                      sum([transcoded_bytes(params) for params in params_list]), error=failed)
+        except Exception:
+            logger.error('Statement failed: %s ::: %d rows', sql, len(params_list or ()))
+            raise
+        if self.db.bulk_loader is not None:
+            # A multi-row insert (BULK_INSERT 'union') writes several rows by parameters
+            self.db.bulk_loader.written(len(params_list) * (sql.count(' UNION ALL ') + 1))
+        return rcode
+
+    def executemany_iter(self, sql, rows, batch_size=None, progress=None):
+        """
+        Sends the rows of an iterable (ie: a generator) by slices of batch_size
+        rows, only one slice is encoded and held in memory. progress(count) is
+        called with the count of rows sent after each slice. Returns the count
+        of rows sent.
+        """
+        batch_size = batch_size or self.db.settings_dict.get('WRITE_CHUNK_SIZE', 1000)
+        count = 0
+        for params_list in slices(rows, batch_size):
+            # Called through the Django cursor, which only marks execute() and
+            # executemany() dirty
+            self.set_dirty()
+            self.executemany(sql, params_list)
+            count += len(params_list)
+            if progress is not None:
+                progress(count)
+        return count
+
+    def _executemany(self, sql, params_list):
+        """
+        Sends the rows with the array binding of pyodbc (fast_executemany) when
+        FAST_EXECUTEMANY is set, the input sizes are given so the driver does
+        not guess them from the first row. If the driver rejects the array
+        binding, the rows are sent one by one and the array binding is not
+        tried again by this connection.
+        """
+        db = self.db
+        if not (db.fast_executemany and params_list and hasattr(self.cursor, 'fast_executemany')):
+            return self.cursor.executemany(sql, params_list)
+
+        try:
+            self.cursor.fast_executemany = True
+            self.cursor.setinputsizes(input_sizes(params_list))
+            return self.cursor.executemany(sql, params_list)
+        except Database.Error, e:
+            if not (e.args and e.args[0] in FAST_EXECUTEMANY_UNSUPPORTED):
+                raise
+        finally:
+            self.cursor.fast_executemany = False
+            try:
+                self.cursor.setinputsizes(None)
+            except Database.Error:
+                pass
+
+        warnings.warn('fast_executemany rejected by the driver (%s), FAST_EXECUTEMANY is disabled' % e.args[0])
+        db.fast_executemany = False
         return self.cursor.executemany(sql, params_list)
 
-    def format_results(self, rows):
+    def get_row_decoder(self):
+        """
+        Returns the row decoder of the current result set, it is built from the
+        cursor description on the first fetch.
+        """
+        if self._row_decoder is None:
+            self._row_decoder = row_decoder(self.cursor.description, self.driver_needs_utf8, self.oecpinternal)
+        return self._row_decoder
+
+    def format_results(self, row):
         """
         Decode data coming from the database if needed and convert rows to tuples
         (pyodbc Rows are not sliceable).
         """
-        #import pdb; pdb.set_trace()
-        
-        if not self.driver_needs_utf8:
-            return tuple(rows)
-        
-        fr = []
-        for row in rows:
-            if isinstance(row, str):
-                fr.append(row.decode(self.oecpinternal).encode('utf-8').decode('utf-8'))                
-            else:
-                fr.append(row)
-        return tuple(fr)
+        return self.get_row_decoder()(row)
 
     def fetchone(self):
+        if self.instrument is not None:
+            rows = self._instrumented_fetch(self.cursor.fetchone)
+            return rows and rows[0] or []
         row = self.cursor.fetchone()
         if row is not None:
-            return self.format_results(row)
+            return self.get_row_decoder()(row)
         return []
 
     def fetchmany(self, chunk):
-        return [self.format_results(row) for row in self.cursor.fetchmany(chunk)]
+        if self.instrument is not None:
+            return self._instrumented_fetch(self.cursor.fetchmany, chunk)
+        decoder = self.get_row_decoder()
+        return [decoder(row) for row in self.cursor.fetchmany(chunk)]
 
     def fetchall(self):
-        return [self.format_results(row) for row in self.cursor.fetchall()]
+        if self.instrument is not None:
+            return self._instrumented_fetch(self.cursor.fetchall)
+        decoder = self.get_row_decoder()
+        return [decoder(row) for row in self.cursor.fetchall()]
+
+    def _instrumented_fetch(self, fetch, *args):
+        """
+        Fetches and decodes rows, the measures are reported to the instrument
+        in the statement that was executed. Returns a list of rows.
+        """
+        start = time.time()
+        rows = fetch(*args)
+        fetched = time.time()
+        if rows is None:
+            rows = []
+        elif not isinstance(rows, list):
+            rows = [rows]
+        decoder = self.get_row_decoder()
+        rows = [decoder(row) for row in rows]
+        if decoder is tuple:
+            transcoded = 0
+        else:
+            transcoded = sum([transcoded_bytes(row) for row in rows])
+        self.instrument.record(self.last_sql, 'fetch', None, len(rows),
+                               fetched - start, time.time() - fetched, transcoded)
+        return rows
 
     def __getattr__(self, attr):
         if attr in self.__dict__:
@@ -615,7 +955,15 @@ class CursorWrapper(object):
         return getattr(self.cursor, attr)
     
     def __iter__(self):
-        return iter(self.cursor)
+        for rows in iter((lambda: self.fetchmany(self.db.chunk_size)), []):
+            for row in rows:
+                yield row
+
+    def close(self):
+        self.cursor.close()
+        if self.on_close is not None:
+            on_close, self.on_close = self.on_close, None
+            on_close()
     
     ############## 20131007 ################
     def set_dirty(self):
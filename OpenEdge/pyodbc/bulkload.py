@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Bulk-load mode of the OpenEdge backend.
+
+In a bulk load, the statements of the connection are not committed one by one :
+the rows are committed every commit_rows rows written, and commit_rows is
+adapted after each commit so a commit happens about every commit_seconds
+seconds. The non-unique indexes of the tables loaded can be dropped before the
+load and are created again at the end, even when the load fails.
+
+    with connection.bulk_load(Item, drop_indexes=True):
+        Item.objects.bulk_create(items)
+
+When the load fails, the rows of the pending batch are rolled back, the batches
+already committed stay in the tables. A bulk load can not be started in a
+managed transaction.
+
+The default sizes are set with the BULK_COMMIT_ROWS (10000) and
+BULK_COMMIT_SECONDS (1.0) keys of the database settings.
+'''
+
+import time
+
+from django.db.transaction import TransactionManagementError
+from django.db.utils import DatabaseError
+
+from OpenEdge.pyodbc.catalog import get_catalog
+from OpenEdge.pyodbc.names import model_names, physical_name
+
+# Bounds of the adapted commit_rows
+MIN_COMMIT_ROWS = 100
+MAX_COMMIT_ROWS = 1000000
+
+
+class BulkLoad(object):
+    """
+    Context manager of a bulk load, see DatabaseWrapper.bulk_load().
+    tables are models or table names.
+    """
+    def __init__(self, connection, tables=(), drop_indexes=False, commit_rows=None, commit_seconds=None):
+        settings_dict = connection.settings_dict
+        self.connection = connection
+        self.tables = [isinstance(t, basestring) and physical_name(t) or model_names(t).table for t in tables]
+        self.drop_indexes = drop_indexes
+        self.commit_rows = commit_rows or settings_dict.get('BULK_COMMIT_ROWS', 10000)
+        self.commit_seconds = commit_seconds or settings_dict.get('BULK_COMMIT_SECONDS', 1.0)
+        # (table, index name, columns) of the dropped indexes
+        self.dropped = []
+        self.rows = 0
+        self.pending = 0
+        self.commits = 0
+        self._batch_start = None
+
+    def __enter__(self):
+        db = self.connection
+        if db.bulk_loader is not None or db.is_managed():
+            raise TransactionManagementError('A bulk load can not run in a transaction or another bulk load')
+        if self.drop_indexes:
+            self.drop()
+        db.enter_transaction_management()
+        db.managed(True)
+        db.bulk_loader = self
+        self._batch_start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        db = self.connection
+        db.bulk_loader = None
+        try:
+            try:
+                if exc_type is None:
+                    self.commit()
+                else:
+                    db.rollback()
+            finally:
+                db.leave_transaction_management()
+        finally:
+            self.restore()
+        return False
+
+    def written(self, rows):
+        """
+        Counts the rows written by a statement, commits when the batch is full.
+        """
+        self.rows += rows
+        self.pending += rows
+        if self.pending >= self.commit_rows:
+            self.commit()
+
+    def commit(self):
+        """
+        Commits the pending rows and adapts commit_rows to the time of the batch.
+        """
+        self.connection.commit()
+        now = time.time()
+        if self.pending:
+            rate = self.pending / max(now - self._batch_start, 0.001)
+            target = int(rate * self.commit_seconds)
+            self.commit_rows = min(max((self.commit_rows + target) // 2, MIN_COMMIT_ROWS), MAX_COMMIT_ROWS)
+            self.commits += 1
+        self.pending = 0
+        self._batch_start = now
+
+    def drop(self):
+        """
+        Drops the non-unique indexes of the tables, the columns of the indexes
+        are read from the catalog.
+        """
+        db = self.connection
+        cursor = db.cursor()
+        # The catalog queries use the '?' placeholders of a pyodbc cursor
+        raw = db.connection.cursor()
+        catalog = get_catalog(getattr(db, 'alias', 'default'), db.owner)
+        try:
+            for table in self.tables:
+                columns = catalog.indexes(table, raw)
+                for name, index in sorted(db.introspection.get_indexes(cursor, table).items()):
+                    if index['unique'] or index['primary_key'] or name not in columns:
+                        continue
+                    cursor.execute('DROP INDEX "%s" ON "%s"' % (name, table))
+                    self.dropped.append((table, name, columns[name]['columns']))
+            db.commit_unless_managed()
+        except:
+            self.restore()
+            raise
+        finally:
+            raw.close()
+
+    def restore(self):
+        """
+        Creates the dropped indexes again, all of them are tried before an
+        error is raised.
+        """
+        if not self.dropped:
+            return
+        cursor = self.connection.cursor()
+        failed = []
+        while self.dropped:
+            table, name, columns = self.dropped.pop(0)
+            try:
+                cursor.execute('CREATE INDEX "%s" ON "%s" (%s)'
+                               % (name, table, ', '.join(['"%s"' % c for c in columns])))
+            except Exception, e:
+                failed.append('%s (%s)' % (name, e))
+        self.connection.commit_unless_managed()
+        if failed:
+            raise DatabaseError('Indexes not restored after the bulk load: %s' % ', '.join(failed))
+
+    def stats(self):
+        return {'rows': self.rows, 'commits': self.commits, 'commit_rows': self.commit_rows}
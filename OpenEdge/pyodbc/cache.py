@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Bounded LRU caches of the OpenEdge backend.
+
+The caches are shared by the DatabaseWrapper of all the threads of a process,
+one cache by name and database alias. Their hit/miss/eviction counters are
+returned by cache_stats().
+'''
+
+import threading
+
+# Caches of the process, by (name, alias)
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name, alias, maxsize):
+    """
+    Returns the LRU cache of this name for a database alias, it is created on
+    the first call.
+    """
+    key = (name, alias)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = LRUCache(maxsize)
+    return cache
+
+
+def cache_stats():
+    """
+    Returns the counters of all the caches of the process, by (name, alias).
+    """
+    with _caches_lock:
+        caches = _caches.items()
+    return dict([(key, cache.stats()) for key, cache in caches])
+
+
+class LRUCache(object):
+    """
+    Thread safe mapping keeping the maxsize most recently used entries.
+
+    The entries are links [prev, next, key, value] of a circular doubly linked
+    list, the most recently used is just before the root link.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._map = {}
+        self._root = []
+        self._root[:] = [self._root, self._root, None, None]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            link = self._map.get(key)
+            if link is None:
+                self.misses += 1
+                return default
+            # Move the link just before the root
+            prev, next = link[0], link[1]
+            prev[1] = next
+            next[0] = prev
+            root = self._root
+            last = root[0]
+            last[1] = root[0] = link
+            link[0] = last
+            link[1] = root
+            self.hits += 1
+            return link[3]
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            link = self._map.get(key)
+            if link is not None:
+                link[3] = value
+                return
+            root = self._root
+            if len(self._map) >= self.maxsize:
+                # Reuse the least recently used link
+                oldest = root[1]
+                del self._map[oldest[2]]
+                root[1] = oldest[1]
+                oldest[1][0] = root
+                self.evictions += 1
+            last = root[0]
+            link = [last, root, key, value]
+            last[1] = root[0] = self._map[key] = link
+
+    def pop(self, key, default=None):
+        with self._lock:
+            link = self._map.pop(key, None)
+            if link is None:
+                return default
+            link[0][1] = link[1]
+            link[1][0] = link[0]
+            return link[3]
+
+    def clear(self):
+        with self._lock:
+            self._map.clear()
+            self._root[:] = [self._root, self._root, None, None]
+
+    def __len__(self):
+        return len(self._map)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._map),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+SYSPROGRESS catalog cache of the OpenEdge backend.
+
+The columns, indexes and sequences of a schema are read once per process and
+database alias, with one query per catalog table when the first connection
+of the schema is bootstrapped (CATALOG_WARMUP key of the database settings,
+True by default). A table missing from the cache is read on its first use.
+
+The DDL statements run by CursorWrapper invalidate the entries of their table
+(or the whole cache when the table is not found in the statement). The DDL run
+by other processes is not seen, invalidate_catalog() resets the cache.
+'''
+
+import re
+import threading
+
+from OpenEdge.pyodbc.names import physical_name
+
+WARMUP_QUERIES = {
+    'columns': 'SELECT TBL, COL FROM SYSPROGRESS.SYSCOLUMNS WHERE OWNER = ?',
+    'indexes': 'SELECT TBL, IDXNAME, IDXTYPE, COLNAME FROM SYSPROGRESS.SYSINDEXES '
+               'WHERE IDXOWNER = ? ORDER BY TBL, IDXNAME, IDXSEQ',
+    'sequences': 'SELECT "SEQ-NAME" FROM SYSPROGRESS.SYSSEQUENCES WHERE "SEQ-OWNER" = ?',
+}
+TABLE_QUERIES = {
+    'columns': 'SELECT TBL, COL FROM SYSPROGRESS.SYSCOLUMNS WHERE OWNER = ? AND TBL = ?',
+    'indexes': 'SELECT TBL, IDXNAME, IDXTYPE, COLNAME FROM SYSPROGRESS.SYSINDEXES '
+               'WHERE IDXOWNER = ? AND TBL = ? ORDER BY IDXNAME, IDXSEQ',
+}
+
+# Table of a DDL statement : CREATE/ALTER/DROP TABLE t, CREATE INDEX i ON t
+_ddl_table = re.compile(r'\b(?:TABLE|ON)\s+(?:"?\w+"?\s*\.\s*)?"?(\w+)"?', re.I)
+_ddl_sequence = re.compile(r'\bSEQUENCE\b', re.I)
+
+# Catalogs of the process, by (alias, owner)
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(alias, owner):
+    """
+    Returns the catalog cache of a schema, it is created on the first call.
+    """
+    key = (alias, owner)
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = _catalogs[key] = Catalog(owner)
+    return catalog
+
+
+def invalidate_catalog(alias, sql=None):
+    """
+    Invalidates the catalogs of a database alias after a DDL statement, or
+    entirely when sql is None.
+    """
+    with _catalogs_lock:
+        catalogs = [c for (a, owner), c in _catalogs.items() if a == alias]
+    table = None
+    if sql is not None:
+        m = _ddl_table.search(sql)
+        # The cache is keyed by the physical (truncated) names
+        table = m and physical_name(m.group(1))
+        if table is None and _ddl_sequence.search(sql):
+            for catalog in catalogs:
+                catalog.invalidate_sequences()
+            return
+    for catalog in catalogs:
+        catalog.invalidate(table)
+
+
+class Catalog(object):
+    """
+    Columns, indexes and sequences of a schema. The cursors given to the
+    methods are pyodbc cursors ('?' placeholders). The tables are keyed by
+    their lower case name, OpenEdge names are not case sensitive.
+    """
+    def __init__(self, owner):
+        self.owner = owner
+        self._lock = threading.Lock()
+        self._columns = {}
+        self._indexes = {}
+        self._sequences = None
+        self.warm = False
+        self.queries = 0
+
+    def _fetch(self, cursor, sql, *params):
+        with self._lock:
+            self.queries += 1
+        return cursor.execute(sql, *params).fetchall()
+
+    def warmup(self, cursor):
+        """
+        Reads the columns, indexes and sequences of the schema.
+        """
+        columns, indexes = {}, {}
+        for tbl, col in self._fetch(cursor, WARMUP_QUERIES['columns'], self.owner):
+            columns.setdefault(tbl.lower(), []).append(col)
+        for row in self._fetch(cursor, WARMUP_QUERIES['indexes'], self.owner):
+            self._add_index(indexes, *row)
+        sequences = set([row[0] for row in self._fetch(cursor, WARMUP_QUERIES['sequences'], self.owner)])
+        with self._lock:
+            self._columns = columns
+            self._indexes = indexes
+            self._sequences = sequences
+            self.warm = True
+
+    def _add_index(self, indexes, tbl, idxname, idxtype, colname):
+        index = indexes.setdefault(tbl.lower(), {}).setdefault(idxname, {'unique': idxtype == 'U', 'columns': []})
+        index['columns'].append(colname)
+
+    def columns(self, table, cursor):
+        """
+        Returns the column names of a table, [] if it does not exist.
+        """
+        key = table.lower()
+        columns = self._columns.get(key)
+        if columns is None:
+            columns = [col for tbl, col in self._fetch(cursor, TABLE_QUERIES['columns'], self.owner, table)]
+            with self._lock:
+                self._columns[key] = columns
+        return columns
+
+    def cached_columns(self, table):
+        """
+        Returns the column names of a table when they are cached, or None.
+        """
+        return self._columns.get(table.lower())
+
+    def has_column(self, table, column, cursor):
+        return column in self.columns(table, cursor)
+
+    def indexes(self, table, cursor):
+        """
+        Returns the indexes of a table : {name: {'unique': bool, 'columns': [...]}}.
+        """
+        key = table.lower()
+        indexes = self._indexes.get(key)
+        if indexes is None:
+            found = {}
+            for row in self._fetch(cursor, TABLE_QUERIES['indexes'], self.owner, table):
+                self._add_index(found, *row)
+            indexes = found.get(key, {})
+            with self._lock:
+                self._indexes[key] = indexes
+        return indexes
+
+    def sequences(self, cursor):
+        """
+        Returns the set of the sequence names of the schema.
+        """
+        sequences = self._sequences
+        if sequences is None:
+            sequences = set([row[0] for row in self._fetch(cursor, WARMUP_QUERIES['sequences'], self.owner)])
+            with self._lock:
+                self._sequences = sequences
+        return sequences
+
+    def invalidate(self, table=None):
+        """
+        Forgets a table, or the whole schema when table is None.
+        """
+        with self._lock:
+            if table is None:
+                self._columns = {}
+                self._indexes = {}
+                self._sequences = None
+                self.warm = False
+            else:
+                self._columns.pop(table.lower(), None)
+                self._indexes.pop(table.lower(), None)
+
+    def invalidate_sequences(self):
+        with self._lock:
+            self._sequences = None
@@ -13,41 +13,22 @@ from django.db.utils import DatabaseError
 from datetime import datetime
 import re
 from django.db.models.sql.datastructures import EmptyResultSet
+from django.db.models.sql.where import Constraint, EmptyShortCircuit, ExtraWhere, WhereNode
+from django.core.exceptions import ObjectDoesNotExist
 from django.utils.encoding import smart_str, smart_unicode
 from django.db.models.sql.constants import (SINGLE, MULTI, ORDER_DIR, GET_ITERATOR_CHUNK_SIZE)
+from OpenEdge.pyodbc.streaming import chunk_iter, ReadAhead
+from OpenEdge.pyodbc.identifiers import truncate_identifiers
+from OpenEdge.pyodbc.names import model_names
 
 
 class SQLCompiler(compiler.SQLCompiler):
     def formatTableName(self,data):
-        #import pdb; pdb.set_trace()
-        if isinstance(data,list) is True:
-            for i,v in enumerate(data):
-                tv=v.split('"')
-                for iv,vv in enumerate(tv):
-                    tv[iv]=vv[:self.connection.ops.max_name_length()]
-                data[i]='"'.join(tv)
-            return data
-        else :            
-            tdata=data.split('"')
-            for i,v in enumerate(tdata):
-                #===============================================================
-                # If where clause is IN (val,val...), or LIKE  be careful to not substring the IN clause
-                #===============================================================
-                if 'IN (' in v or ' LIKE ' in v:
-                    if 'COLLATE' in v:
-                        tdata[i]=re.sub('COLLATE (\w+) ','',v)
-                    else:
-                        tdata[i]=v
-                else:
-                    tdata[i]=v[:self.connection.ops.max_name_length()]
-                #===============================================================
-                # if 'IN (' not in v:
-                #     tdata[i]=v[:MAX_TABLE_NAME]
-                # else:
-                #     tdata[i]=v
-                #===============================================================
-                    
-            return '"'.join(tdata)
+        """
+        Truncates the quoted identifiers of an SQL fragment (or of a list of
+        fragments) to the OpenEdge name length, see OpenEdge.pyodbc.identifiers.
+        """
+        return truncate_identifiers(data, self.connection.ops.max_name_length())
     
     def as_sql(self, with_limits=True, with_col_aliases=False):
         #import pdb; pdb.set_trace()
@@ -62,6 +43,38 @@ class SQLCompiler(compiler.SQLCompiler):
             return '', ()
 
         self.pre_sql_setup()
+
+        #=======================================================================
+        # The SQL of the same query structure is taken from the compiled
+        # cache, only the parameters are collected
+        #=======================================================================
+        qn = self.quote_name_unless_alias
+        compiled_cache = self.connection.compiled_cache
+        key = None
+        if compiled_cache.maxsize > 0:
+            key = self.structure_key(with_limits, with_col_aliases)
+        if key is not None:
+            where_parts = self.where_parts(self.query.where)
+            if where_parts is None:
+                key = None
+            else:
+                key += (where_parts[0],)
+                w_params = where_parts[1]
+                try:
+                    compiled = compiled_cache.get(key)
+                except TypeError:
+                    # Value annotation not hashable
+                    key = compiled = None
+                if compiled is not None:
+                    sql, self.query.ordering_aliases, where_repeat = compiled
+                    params = []
+                    for val in self.query.extra_select.itervalues():
+                        params.extend(val[1])
+                    params.extend(tuple(w_params) * where_repeat)
+                    return sql, tuple(params)
+        # Count of the WHERE parameters in the statement (NOT IN paging repeats them)
+        self.where_repeat = 1
+
         # After executing the query, we must get rid of any joins the query
         # setup created. So, take note of alias counts before the query ran.
         # However we do not want to get rid of stuff done in pre_sql_setup(),
@@ -71,14 +84,19 @@ class SQLCompiler(compiler.SQLCompiler):
         out_cols = self.get_columns(with_col_aliases)
         ordering, ordering_group_by = self.get_ordering()
 
+        #=======================================================================
+        # The pages need a stable order, the primary key breaks the ties
+        #=======================================================================
+        paging = with_limits and self.query.low_mark
+        if paging and self.query.group_by is None:
+            ordering = self.stable_ordering(ordering)
+
         distinct_fields = self.get_distinct()
 
         # This must come after 'select', 'ordering' and 'distinct' -- see
         # docstring of get_from_clause() for details.
         from_, f_params = self.get_from_clause()
 
-        qn = self.quote_name_unless_alias
-                
         where, w_params = self.query.where.as_sql(qn=qn, connection=self.connection)
         having, h_params = self.query.having.as_sql(qn=qn, connection=self.connection)
         params = []
@@ -102,10 +120,34 @@ class SQLCompiler(compiler.SQLCompiler):
 
         if where:
             where=self.formatTableName(where)
+
+        if paging and not self.connection.ops.supports_offset_fetch():
+            if self.can_skip_by_key(distinct_fields, having, ordering):
+                #===============================================================
+                # Before OpenEdge 11.2 : the rows of the previous pages are
+                # excluded by primary key, in the same query
+                #===============================================================
+                pk = self.pk_column()
+                previous = 'SELECT TOP %d %s FROM %s' % (self.query.low_mark, pk, ' '.join(from_))
+                if where:
+                    previous += ' WHERE %s' % where
+                previous += ' ORDER BY %s' % ', '.join(ordering)
+                condition = '%s NOT IN (%s)' % (pk, previous)
+                w_params = tuple(w_params) + tuple(f_params) + tuple(w_params)
+                self.where_repeat = 2
+                where = where and '(%s) AND %s' % (where, condition) or condition
+            else:
+                # Without ROW_NUMBER, the server would read all the rows up to
+                # the high mark
+                raise DatabaseError(
+                    "The offset of a query with DISTINCT, GROUP BY, HAVING, extra select or "
+                    "aggregates needs OFFSET/FETCH, available since OpenEdge 11.2.")
+
+        if where:
             result.append('WHERE %s' % where)
             params.extend(w_params)
 
-        grouping, gb_params = self.get_grouping(True)
+        grouping, gb_params = self.get_grouping(ordering_group_by)
         if grouping:
             if distinct_fields:
                 raise NotImplementedError(
@@ -133,16 +175,15 @@ class SQLCompiler(compiler.SQLCompiler):
 
         if with_limits:
             #===================================================================
-            # OpenEdge use TOP, not LIMIT
+            # OpenEdge use TOP, not LIMIT, and OFFSET/FETCH since 11.2
             #===================================================================
-            if self.query.high_mark is not None:
-                result[0]+=' TOP %d' % (self.query.high_mark - self.query.low_mark)
-            if self.query.low_mark:
-                if self.query.high_mark is None:
-                    val = self.connection.ops.no_limit_value()
-                    if val:
-                        result[0]+=' TOP %d' % val
-                #result.append('OFFSET %d' % self.query.low_mark)
+            low_mark, high_mark = self.query.low_mark, self.query.high_mark
+            if low_mark and self.connection.ops.supports_offset_fetch():
+                result.append('OFFSET %d ROWS' % low_mark)
+                if high_mark is not None:
+                    result.append('FETCH NEXT %d ROWS ONLY' % (high_mark - low_mark))
+            elif high_mark is not None:
+                result[0]+=' TOP %d' % (high_mark - low_mark)
 
         if self.query.select_for_update and self.connection.features.has_select_for_update:
             # If we've been asked for a NOWAIT query but the backend does not support it,
@@ -154,8 +195,136 @@ class SQLCompiler(compiler.SQLCompiler):
 
         # Finally do cleanup - get rid of the joins we created above.
         self.query.reset_refcounts(self.refcounts_before)
-        
-        return ' '.join(result), tuple(params)
+
+        sql = ' '.join(result)
+        if key is not None and not f_params:
+            compiled_cache.put(key, (sql, self.query.ordering_aliases, self.where_repeat))
+        return sql, tuple(params)
+
+    def structure_key(self, with_limits, with_col_aliases):
+        """
+        Returns the structure of the query (model, columns, joins, ordering,
+        limits) as the key of the compiled cache, or None if the SQL of this
+        query is not cached : grouping, having, aggregates and the select
+        expressions are compiled each time. The structure of the where is
+        added by as_sql, see where_parts.
+        """
+        query = self.query
+        if (with_col_aliases or query.group_by is not None or query.having.children
+                or query.aggregate_select or query.select_for_update):
+            return None
+        for col in query.select:
+            if not isinstance(col, tuple):
+                return None
+
+        alias_map = query.alias_map
+        refcount = query.alias_refcount
+        try:
+            key = (
+                self.connection.alias, query.model, with_limits,
+                tuple(query.select), query.default_cols,
+                tuple(query.related_select_cols),
+                tuple(sorted(query.included_inherited_models.items())),
+                frozenset(query.deferred_loading[0]), query.deferred_loading[1],
+                tuple([(alias, col[0]) for alias, col in query.extra_select.iteritems()]),
+                tuple(query.extra_tables),
+                tuple([(alias, alias_map[alias], refcount[alias]) for alias in query.tables]),
+                tuple(query.order_by), tuple(query.extra_order_by),
+                query.default_ordering, query.standard_ordering,
+                query.distinct, tuple(query.distinct_fields),
+                query.low_mark, query.high_mark,
+            )
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def where_parts(self, node):
+        """
+        Returns the structure of a where node and its parameters, in the order
+        of its SQL. The structure is what the SQL depends on : connectors,
+        negations, columns, lookup types and the count of values of the IN
+        lookups. None when the SQL can change with the values : expressions,
+        subqueries, empty nodes and values matching nothing.
+        """
+        if isinstance(node, ExtraWhere):
+            return tuple(node.sqls), tuple(node.params or ())
+        if not isinstance(node, WhereNode):
+            return None
+        connection = self.connection
+        children = []
+        params = []
+        for child in node.children:
+            if not isinstance(child, tuple):
+                parts = self.where_parts(child)
+                if parts is None:
+                    return None
+                children.append(parts[0])
+                params.extend(parts[1])
+                continue
+            constraint, lookup_type, value_annotation, value = child
+            if (not isinstance(constraint, Constraint) or hasattr(value, 'as_sql')
+                    or hasattr(value, '_as_sql') or hasattr(value, 'evaluate')):
+                return None
+            if lookup_type == 'in':
+                if not value_annotation:
+                    return None
+                count = len(value)
+            else:
+                count = lookup_type == 'exact' and value == ''
+            children.append((constraint.alias, constraint.col, lookup_type, value_annotation, count))
+            if lookup_type == 'isnull':
+                continue
+            try:
+                if constraint.field is not None:
+                    # Constraint.process() without the db_type of the field
+                    child_params = constraint.field.get_db_prep_lookup(lookup_type, value,
+                                                                       connection=connection, prepared=True)
+                else:
+                    child_params = constraint.process(lookup_type, value, connection)[1]
+            except (ObjectDoesNotExist, EmptyShortCircuit):
+                return None
+            if (count is True and connection.features.interprets_empty_strings_as_nulls
+                    and len(child_params) == 1 and child_params[0] == ''):
+                # Compiled as IS NULL
+                continue
+            params.extend(child_params)
+        return (node.connector, node.negated, tuple(children)), params
+
+    def pk_column(self):
+        """
+        Returns the qualified primary key column of the base table.
+        """
+        opts = self.query.model._meta
+        qn = self.quote_name_unless_alias
+        return self.formatTableName('%s.%s' % (qn(self.query.tables[0]),
+                                                self.connection.ops.quote_name(opts.pk.column)))
+
+    def stable_ordering(self, ordering):
+        """
+        Returns the ordering of a page, the primary key is added as the last
+        sort key when it is not already sorted (not with DISTINCT or aggregates,
+        the key is not selected).
+        """
+        pk = self.pk_column()
+        if not ordering:
+            return [pk]
+        if self.query.distinct or self.query.aggregate_select:
+            return ordering
+        for col in ordering:
+            if self.formatTableName(col.rsplit(' ', 1)[0]) == pk:
+                return ordering
+        return ordering + [pk]
+
+    def can_skip_by_key(self, distinct_fields, having, ordering):
+        """
+        The rows of the previous pages can be excluded by primary key when the
+        subquery selecting them can repeat the FROM, WHERE and ORDER BY clauses.
+        """
+        query = self.query
+        return not (query.distinct or distinct_fields or having or query.group_by is not None
+                    or query.extra_select or query.aggregate_select or query.ordering_aliases
+                    or not ordering)
 
     def execute_sql(self, result_type=MULTI):
         """
@@ -181,6 +350,33 @@ class SQLCompiler(compiler.SQLCompiler):
             else:
                 return
 
+        chunked_reads = result_type == MULTI and self.connection.features.can_use_chunked_reads
+        if chunked_reads:
+            #===================================================================
+            # Read by blocks, on a dedicated connection when the caller asked
+            # for a stream (see OpenEdge.pyodbc.streaming.stream), the cursor
+            # is closed by chunk_iter
+            #===================================================================
+            if getattr(self.query, 'stream', False):
+                cursor = self.connection.chunked_cursor()
+            else:
+                cursor = self.connection.cursor()
+            try:
+                cursor.execute(sql, params)
+            except:
+                cursor.close()
+                raise
+            if self.connection.prefetch and getattr(cursor, 'on_close', None) is not None:
+                # Read ahead, only on a dedicated connection
+                result = iter(ReadAhead(cursor, self.connection.chunk_size,
+                                        self.connection.features.empty_fetchmany_value,
+                                        len(self.query.ordering_aliases), self.connection.prefetch))
+            else:
+                result = chunk_iter(cursor, self.connection.chunk_size,
+                                    self.connection.features.empty_fetchmany_value,
+                                    len(self.query.ordering_aliases))
+            return result
+
         cursor = self.connection.cursor()        
         cursor.execute(sql, params)
 
@@ -191,19 +387,16 @@ class SQLCompiler(compiler.SQLCompiler):
                 return cursor.fetchone()[:-len(self.query.ordering_aliases)]
             return cursor.fetchone()
 
-        # The MULTI case.
+        # The MULTI case, without chunked reads we return the same data
+        # structure as normally, but ensure it is all read into memory
+        # before going any further.
         if self.query.ordering_aliases:
             result = order_modified_iter(cursor, len(self.query.ordering_aliases),
                     self.connection.features.empty_fetchmany_value)
         else:
             result = iter((lambda: cursor.fetchmany(GET_ITERATOR_CHUNK_SIZE)),
                     self.connection.features.empty_fetchmany_value)
-        if not self.connection.features.can_use_chunked_reads:
-            # If we are using non-chunked reads, we return the same data
-            # structure as normally, but ensure it is all read into memory
-            # before going any further.
-            return list(result)
-        return result
+        return list(result)
 
 def order_modified_iter(cursor, trim, sentinel):
     """
@@ -234,6 +427,7 @@ class SQLInsertCompiler(SQLCompiler):
         # going to be column names (so we can avoid the extra overhead).
         qn = self.connection.ops.quote_name
         opts = self.query.model._meta
+        names = model_names(self.query.model)
         self.ID = None
         
         #import pdb; pdb.set_trace()
@@ -241,7 +435,7 @@ class SQLInsertCompiler(SQLCompiler):
         owner = self.connection.owner
         
         table_has_col_id = False
-        curtable=opts.db_table[:self.connection.ops.max_name_length()]
+        curtable=names.table
         
         #import pdb; pdb.set_trace()
         #=======================================================================
@@ -254,12 +448,12 @@ class SQLInsertCompiler(SQLCompiler):
         #     table_has_col_id = True
         #=======================================================================
         
-        result = ['INSERT INTO %s' % qn(curtable)]
+        result = ['INSERT INTO %s' % names.qtable]
         
         has_fields = bool(self.query.fields)
         fields = self.query.fields if has_fields else [opts.pk]
         
-        lfields='(%s' % ', '.join([qn(f.column) for f in fields])
+        lfields='(%s' % names.column_list(fields)
         
         #=======================================================================
         # Test if id col is provided , if not, we have to add it (Openedge does not support autoincrement field)
@@ -320,7 +514,7 @@ class SQLInsertCompiler(SQLCompiler):
             #===================================================================
             # Transcode unicode to string (openedge issue)
             #===================================================================
-            col = "%s.%s" % (qn(curtable), qn(opts.pk.column))
+            col = "%s.%s" % (names.qtable, names.qcolumns.get(opts.pk.column))
             result.append("VALUES (%s" % ", ".join(placeholders[0]))
             
             if hasIdCol is False and table_has_col_id is True:
@@ -336,12 +530,19 @@ class SQLInsertCompiler(SQLCompiler):
             self.bulk_load=True
             tabID=None            
             if hasIdCol is False and table_has_col_id is True:
+                #===============================================================
+                # The ids of all the rows are fetched in one statement
+                #===============================================================
+                ids = self.connection.ops.get_autoinc_keyvals(opts.db_table, 'id', self.connection.ops.max_name_length(), cursor, len(values))
                 for i,v in enumerate(values):
-                    values[i].append(self.connection.ops.get_autoinc_keyval(opts.db_table, 'id',self.connection.ops.max_name_length(),cursor))
+                    values[i].append(ids[i])
                     #======================20131101=====================================
                     # values[i].append(cursor.execute('select id_%s.nextval from dual'%opts.db_table[:self.connection.ops.max_name_length()-3]).fetchone()[0])
                     #===========================================================
-                    
+
+            if has_fields and len(values) > 1 and self.connection.settings_dict.get('BULK_INSERT') == 'union':
+                return self.union_sql(" ".join(result), fields, values, hasIdCol is False and table_has_col_id is True)
+            if hasIdCol is False and table_has_col_id is True:
                 result.append(self.connection.ops.bulk_insert_sql(fields, len(values),OEid=1))
             else:    
                 result.append(self.connection.ops.bulk_insert_sql(fields, len(values)))
@@ -361,6 +562,31 @@ class SQLInsertCompiler(SQLCompiler):
             return [(" ".join(result), tuple(params))]       
             
             
+    def union_sql(self, head, fields, values, add_id):
+        """
+        Returns the statements of a bulk insert sending several rows each :
+            INSERT INTO t (cols) SELECT ... FROM DUAL UNION ALL SELECT ...
+        The number of rows of a statement depends on the OpenEdge limits. The
+        full statements are sent by one executemany (FAST_EXECUTEMANY), then
+        the statement of the remaining rows.
+        """
+        ops = self.connection.ops
+        casts = []
+        for field in fields:
+            db_type = field.db_type(self.connection)
+            casts.append(db_type and 'CAST(%%s AS %s)' % db_type or '%s')
+        if add_id:
+            casts.append('CAST(%%s AS %s)' % self.connection.creation.data_types['AutoField'])
+
+        size = ops.union_batch_size(casts, len(head) + 1)
+        statements = {}
+        for start in xrange(0, len(values), size):
+            rows = values[start:start + size]
+            statements.setdefault(len(rows), []).append(tuple([v for row in rows for v in row]))
+        self.bulk_load = True
+        return [("%s %s" % (head, ops.union_insert_sql(casts, count)), statements[count])
+                for count in sorted(statements, reverse=True)]
+
     def execute_sql(self, return_id=False):
         self.bulk_load=False
         assert not (return_id and len(self.query.objs) != 1)
@@ -372,7 +598,8 @@ class SQLInsertCompiler(SQLCompiler):
             for sql, params in sql_param:                            
                 cursor.execute(sql, params)
         else:      
-            cursor.executemany(sql_param[0][0],sql_param[0][1])
+            for sql, params_list in sql_param:
+                cursor.executemany(sql, params_list)
         
         if not (return_id and cursor):
             return
@@ -386,6 +613,9 @@ class SQLInsertCompiler(SQLCompiler):
 class SQLUpdateCompiler(compiler.SQLUpdateCompiler, SQLCompiler):
     pass
 
+class SQLAggregateCompiler(compiler.SQLAggregateCompiler, SQLCompiler):
+    pass
+
 class SQLDeleteCompiler(compiler.SQLDeleteCompiler, SQLCompiler):
     
     #===========================================================================
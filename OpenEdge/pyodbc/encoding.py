@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Parameter encoding of the OpenEdge backend.
+
+The converter of each parameter is chosen from its type once : a row encoder is
+built for the types of a row and reused for the following rows of the same
+types, so executemany() does not run a type check chain on every value.
+
+In the same way, the rows of a result set are decoded by a function built from
+the cursor description : only the character columns are decoded.
+
+input_sizes() gives the parameter types and sizes of an executemany() for the
+array binding of pyodbc (fast_executemany). The examples are checked with
+python -m doctest encoding.py (pyodbc is needed).
+'''
+
+import codecs
+import datetime
+import decimal
+
+import pyodbc as Database
+
+
+class ParamEncoder(object):
+    """
+    Encodes the statement parameters for the driver :
+        unicode : encoded in UTF-8 if the driver needs it
+        str : transcoded from the OpenEdge codepage to UTF-8 if the driver needs it
+        bool : 1 or 0
+    The other values are sent as is.
+    """
+    # Row encoders kept, by parameter types
+    MAX_ROW_ENCODERS = 256
+
+    def __init__(self, driver_needs_utf8, oecpinternal):
+        self.driver_needs_utf8 = driver_needs_utf8
+        self.oecpinternal = oecpinternal
+        self._converters = {}
+        self._row_encoders = {}
+
+        if driver_needs_utf8:
+            encode_utf8 = codecs.getencoder('utf-8')
+            decode_cp = codecs.getdecoder(oecpinternal)
+            self.base_converters = {
+                unicode: lambda v: encode_utf8(v)[0],
+                str: lambda v: encode_utf8(decode_cp(v)[0])[0],
+                bool: int,
+            }
+        else:
+            self.base_converters = {bool: int}
+
+    def converter(self, t):
+        """
+        Returns the converter of a parameter type, or None if the values of
+        this type are sent as is. The subclasses (ie: SafeUnicode) use the
+        converter of their base type.
+        """
+        try:
+            return self._converters[t]
+        except KeyError:
+            conv = None
+            for base in getattr(t, '__mro__', ()):
+                if base in self.base_converters:
+                    conv = self.base_converters[base]
+                    break
+            self._converters[t] = conv
+            return conv
+
+    def row_encoder(self, types):
+        """
+        Returns a function encoding a row of parameters of these types.
+        """
+        encoder = self._row_encoders.get(types)
+        if encoder is None:
+            convs = [(i, self.converter(t)) for i, t in enumerate(types)]
+            convs = [(i, conv) for i, conv in convs if conv is not None]
+            if not convs:
+                encoder = tuple
+            else:
+                def encoder(row):
+                    row = list(row)
+                    for i, conv in convs:
+                        row[i] = conv(row[i])
+                    return tuple(row)
+            if len(self._row_encoders) >= self.MAX_ROW_ENCODERS:
+                self._row_encoders.clear()
+            self._row_encoders[types] = encoder
+        return encoder
+
+    def encode(self, params):
+        """
+        Encodes one row of parameters.
+        """
+        return self.row_encoder(tuple(map(type, params)))(params)
+
+    def encode_many(self, params_list):
+        """
+        Encodes rows of parameters. The row encoder of the first row is reused
+        while the following rows have the same types.
+        """
+        encoded = []
+        shape = None
+        encoder = None
+        for params in params_list:
+            types = tuple(map(type, params))
+            if types != shape:
+                shape = types
+                encoder = self.row_encoder(types)
+            encoded.append(encoder(params))
+        return encoded
+
+
+def row_decoder(description, driver_needs_utf8, oecpinternal):
+    """
+    Returns a function converting the pyodbc rows of a result set to tuples
+    (pyodbc Rows are not sliceable), the character columns, found from the
+    cursor description, are decoded from the OpenEdge codepage.
+    """
+    if not driver_needs_utf8 or not description:
+        return tuple
+
+    chars = [i for i, desc in enumerate(description) if desc[1] is str]
+    if not chars:
+        return tuple
+
+    decode_cp = codecs.getdecoder(oecpinternal)
+
+    def decoder(row):
+        row = list(row)
+        for i in chars:
+            value = row[i]
+            if value is not None:
+                row[i] = decode_cp(value)[0]
+        return tuple(row)
+    return decoder
+
+
+def _decimal_size(values):
+    """
+    Returns the (precision, scale) holding all the values : the most integer
+    digits plus the most decimal digits.
+
+        >>> _decimal_size([decimal.Decimal('1E+3')])
+        (4, 0)
+        >>> _decimal_size([decimal.Decimal('12.345')])
+        (5, 3)
+        >>> _decimal_size([decimal.Decimal('123.4'), decimal.Decimal('0.0012')])
+        (7, 4)
+        >>> _decimal_size([decimal.Decimal('-0.5'), decimal.Decimal('7')])
+        (2, 1)
+    """
+    integer_digits, scale = 0, 0
+    for value in values:
+        sign, digits, exponent = value.as_tuple()
+        if isinstance(exponent, int):
+            scale = max(scale, -exponent)
+            integer_digits = max(integer_digits, len(digits) + exponent)
+    return max(integer_digits + scale, 1), scale
+
+
+def input_sizes(params_list):
+    """
+    Returns the (sql type, size, decimal digits) of the columns of encoded
+    parameter rows, for cursor.setinputsizes(). The columns of NULL or mixed
+    types are None, their type is chosen by pyodbc.
+    """
+    sizes = []
+    for values in zip(*params_list):
+        types = set([type(v) for v in values if v is not None])
+        if len(types) != 1:
+            sizes.append(None)
+            continue
+        t = types.pop()
+        values = [v for v in values if v is not None]
+        if issubclass(t, str):
+            sizes.append((Database.SQL_VARCHAR, max([len(v) for v in values]) or 1, 0))
+        elif issubclass(t, unicode):
+            sizes.append((Database.SQL_WVARCHAR, max([len(v) for v in values]) or 1, 0))
+        elif issubclass(t, (int, long)):
+            if max([abs(v) for v in values]) > 0x7fffffff:
+                sizes.append((Database.SQL_BIGINT, 0, 0))
+            else:
+                sizes.append((Database.SQL_INTEGER, 0, 0))
+        elif issubclass(t, float):
+            sizes.append((Database.SQL_DOUBLE, 0, 0))
+        elif issubclass(t, decimal.Decimal):
+            precision, scale = _decimal_size(values)
+            sizes.append((Database.SQL_DECIMAL, precision, scale))
+        elif issubclass(t, datetime.datetime):
+            sizes.append((Database.SQL_TYPE_TIMESTAMP, 26, 6))
+        elif issubclass(t, datetime.date):
+            sizes.append((Database.SQL_TYPE_DATE, 10, 0))
+        elif issubclass(t, datetime.time):
+            sizes.append((Database.SQL_TYPE_TIME, 8, 0))
+        else:
+            sizes.append(None)
+    return sizes
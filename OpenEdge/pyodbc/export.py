@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Partitioned export of the OpenEdge tables to CSV or JSON lines.
+
+The queryset is split in key ranges (see OpenEdge.pyodbc.partition), each
+range is read by a worker thread on its own connection (from the pool with the
+POOL key of the database settings), by keyset pages of chunk_size rows (see
+OpenEdge.pyodbc.pagination), so only a page per worker is held in memory.
+
+Each range is written to its own file (split), or to a temporary file, the
+temporary files are then appended in the order of the ranges to the output
+file, which is ordered by the key.
+
+    exporter = Exporter(Order.objects.all(), 'orders.csv', partitions=4)
+    report = exporter.export()
+
+    python manage.py oe_export shop.Order orders.jsonl --format jsonl --partitions 4
+'''
+
+import csv
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+
+from OpenEdge.pyodbc.pagination import keyset_iter
+from OpenEdge.pyodbc.partition import partitions
+
+FORMATS = ('csv', 'jsonl')
+
+
+def csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    return str(value)
+
+
+class RangeWriter(object):
+    """
+    Writes the rows (dicts) of a range to a file.
+    """
+    def __init__(self, f, fields, format, header):
+        self.f = f
+        self.fields = fields
+        self.format = format
+        if format == 'csv':
+            self.writer = csv.writer(f)
+            if header:
+                self.writer.writerow(fields)
+
+    def write(self, row):
+        if self.format == 'csv':
+            self.writer.writerow([csv_value(row[name]) for name in self.fields])
+        else:
+            data = dict([(name, row[name]) for name in self.fields])
+            line = json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+            if isinstance(line, unicode):
+                line = line.encode('utf-8')
+            self.f.write(line + '\n')
+
+
+class Exporter(object):
+    """
+    Exports a queryset, see the module documentation. progress(rows) is called
+    with the total count of rows written after each page.
+    """
+    def __init__(self, queryset, path, format='csv', partitions=4, key=None, fields=None,
+                 split=False, chunk_size=1000, progress=None):
+        if format not in FORMATS:
+            raise ValueError('Unknown export format %s' % format)
+        self.queryset = queryset
+        self.path = path
+        self.format = format
+        self.partitions = partitions
+        self.key = key
+        self.fields = fields or [f.name for f in queryset.model._meta.local_fields]
+        self.split = split
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._failures = []
+        self.rows = 0
+
+    def range_path(self, index):
+        if '%d' in self.path:
+            return self.path % index
+        root, ext = os.path.splitext(self.path)
+        return '%s-%d%s' % (root, index, ext)
+
+    def export(self):
+        """
+        Exports the queryset, returns the report : rows, seconds,
+        rows_per_second, paths and the report of each range.
+        """
+        started = time.time()
+        parts = partitions(self.queryset, self.partitions, self.key)
+        if self.split:
+            paths = [self.range_path(i + 1) for i in xrange(len(parts))]
+        else:
+            paths = ['%s.part%d' % (self.path, i + 1) for i in xrange(len(parts))]
+        reports = [{'partition': part, 'path': path, 'rows': 0, 'seconds': 0.0}
+                   for part, path in zip(parts, paths)]
+
+        try:
+            threads = [threading.Thread(target=self._worker, args=(report, self.split or i == 0),
+                                        name='OpenEdge export %d' % i)
+                       for i, report in enumerate(reports)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            if self._failures:
+                exc_info = self._failures[0]
+                raise exc_info[0], exc_info[1], exc_info[2]
+
+            if not self.split:
+                with open(self.path, 'wb') as output:
+                    for path in paths:
+                        with open(path, 'rb') as f:
+                            shutil.copyfileobj(f, output)
+        finally:
+            if not self.split:
+                for path in paths:
+                    if os.path.exists(path):
+                        os.remove(path)
+
+        seconds = time.time() - started
+        rows = sum([report['rows'] for report in reports])
+        return {'rows': rows, 'seconds': seconds, 'rows_per_second': rows / max(seconds, 0.001),
+                'paths': self.split and paths or [self.path], 'ranges': reports}
+
+    def _worker(self, report, header):
+        started = time.time()
+        try:
+            try:
+                self._export_range(report, header)
+            finally:
+                connections[self.queryset.db].close()
+        except Exception:
+            self._stopped.set()
+            self._failures.append(sys.exc_info())
+        report['seconds'] = time.time() - started
+
+    def _export_range(self, report, header):
+        partition = report['partition']
+        opts = self.queryset.model._meta
+        names = list(self.fields)
+        for name in (partition.key, opts.pk.name):
+            if name not in names:
+                names.append(name)
+        queryset = self.queryset.values(*names)
+
+        sources = [(partition.filter(queryset), [partition.key])]
+        null_rows = partition.null_rows(queryset)
+        if null_rows is not None:
+            sources.append((null_rows, ['pk']))
+
+        with open(report['path'], 'wb') as f:
+            writer = RangeWriter(f, self.fields, self.format, header)
+            pending = 0
+            for rows, keys in sources:
+                for row in keyset_iter(rows, self.chunk_size, keys):
+                    writer.write(row)
+                    pending += 1
+                    if pending == self.chunk_size:
+                        self._written(report, pending)
+                        pending = 0
+            self._written(report, pending)
+
+    def _written(self, report, rows):
+        if self._stopped.is_set():
+            raise RuntimeError('Export stopped by the failure of another range')
+        report['rows'] += rows
+        with self._lock:
+            self.rows += rows
+            total = self.rows
+        if self.progress is not None:
+            self.progress(total)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Identifier truncation of the OpenEdge backend.
+
+OpenEdge names are limited to 32 characters, the quoted identifiers of the SQL
+fragments built by the compiler are truncated in one pass over the fragment.
+The string literals are left as they are, and the COLLATE clauses (not
+supported by OpenEdge) outside of the literals are removed. The examples are
+checked with python -m doctest identifiers.py :
+
+    >>> truncate_identifiers('SELECT "a_very_long_table_name_for_a_test"."id"', 10)
+    'SELECT "a_very_lon"."id"'
+    >>> truncate_identifiers('"t"."name" = \\'a "quoted_and_long_literal" value\\'', 5)
+    '"t"."name" = \\'a "quoted_and_long_literal" value\\''
+    >>> truncate_identifiers('"t"."c" IN (%s, %s) AND "t"."name_of_the_column" LIKE %s ESCAPE \\'\\\\\\' ', 8)
+    '"t"."c" IN (%s, %s) AND "t"."name_of_" LIKE %s ESCAPE \\'\\\\\\' '
+    >>> truncate_identifiers('"t"."name" COLLATE Latin1_General_CI_AS LIKE %s', 32)
+    '"t"."name" LIKE %s'
+    >>> truncate_identifiers('"t"."id" > %s  AND NOT ("t"."qty" = %s  AND "t"."flag" = %s )', 32)
+    '"t"."id" > %s  AND NOT ("t"."qty" = %s  AND "t"."flag" = %s )'
+    >>> truncate_identifiers('"t"."a" = %s AND NOT ("t"."b" BETWEEN %s AND %s AND "t"."c" = %s)', 3)
+    '"t"."a" = %s AND NOT ("t"."b" BETWEEN %s AND %s AND "t"."c" = %s)'
+    >>> truncate_identifiers('(qty+1) AS "x"', 32)
+    '(qty+1) AS "x"'
+    >>> truncate_identifiers(["\\"long_name\\"", '"t"'], 4)
+    ['"long"', '"t"']
+'''
+
+import re
+
+# String literals, split out of the fragments
+_literals = re.compile(r"('(?:[^']|'')*')")
+_collate = re.compile(r'COLLATE \w+ ?')
+
+# Memoised truncations, by (fragment, max length)
+MAX_MEMO = 4096
+_fragments = {}
+
+
+def truncate_identifiers(sql, max_len):
+    """
+    Truncates the quoted identifiers of an SQL fragment, or of a list of
+    fragments, to max_len characters.
+    """
+    if isinstance(sql, list):
+        return [truncate_identifiers(fragment, max_len) for fragment in sql]
+    if '"' not in sql and 'COLLATE' not in sql:
+        return sql
+
+    key = (sql, max_len)
+    try:
+        return _fragments[key]
+    except KeyError:
+        pass
+
+    if "'" in sql:
+        # Out of the literals, every quote is an identifier delimiter
+        parts = _literals.split(sql)
+        parts[::2] = [_truncate(part, max_len) for part in parts[::2]]
+        result = ''.join(parts)
+    else:
+        result = _truncate(sql, max_len)
+
+    if len(_fragments) >= MAX_MEMO:
+        _fragments.clear()
+    _fragments[key] = result
+    return result
+
+
+def _truncate(sql, max_len):
+    """
+    Truncates the identifiers of a fragment without literals : the odd parts
+    between the quotes.
+    """
+    if 'COLLATE' in sql:
+        sql = _collate.sub('', sql)
+    parts = sql.split('"')
+    parts[1::2] = [part[:max_len] for part in parts[1::2]]
+    return '"'.join(parts)
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Statement instrumentation of the OpenEdge backend.
+
+CursorWrapper reports to an instrument the measures of execute, executemany and
+the fetch methods : wall time split in driver time and wrapper transform time
+(SQL preparation, parameter encoding, row decoding), rows and transcoded bytes.
+The instruments are set with the INSTRUMENTATION key of the database settings,
+a class path or a list of class paths (True is StatementStats) :
+
+    DATABASES = {
+        'default': {
+            'ENGINE': 'OpenEdge.pyodbc',
+            ...
+            'INSTRUMENTATION': ['OpenEdge.pyodbc.instrumentation.StatementStats'],
+        }
+    }
+
+The SLOW_QUERY_LOG key adds the slow query log, see OpenEdge.pyodbc.slowlog.
+
+Without INSTRUMENTATION and SLOW_QUERY_LOG, the cursors do not measure anything. The statistics are
+read with get_instrument(alias).stats() :
+
+    from OpenEdge.pyodbc.instrumentation import get_instrument
+    for fp, st in get_instrument('default').top(10):
+        print fp, st['count'], st['total_time'], st['histogram']
+'''
+
+import bisect
+import re
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.importlib import import_module
+
+from OpenEdge.pyodbc.cache import get_cache
+
+#===============================================================================
+# Statement fingerprint : the literals and the placeholders are collapsed
+#===============================================================================
+_literals = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|\?|%s")
+_in_lists = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_blanks = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """
+    Returns the normalised text of a statement : the literals and the
+    placeholders become ?, the IN lists become (...) and the blanks are
+    collapsed.
+    """
+    sql = _literals.sub('?', sql)
+    sql = _in_lists.sub('(...)', sql)
+    return _blanks.sub(' ', sql).strip()
+
+
+# Upper bounds of the histogram buckets, in seconds
+HISTOGRAM_BOUNDS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+# Instruments of the process, by database alias
+_instruments = {}
+_instruments_lock = threading.Lock()
+
+
+def get_instrument(alias, settings_dict=None):
+    """
+    Returns the instrument of a database alias, or None if its settings have
+    no INSTRUMENTATION nor SLOW_QUERY_LOG. It is created on the first call with the settings_dict.
+    """
+    with _instruments_lock:
+        if alias not in _instruments and settings_dict is not None:
+            _instruments[alias] = load_instrument(alias, settings_dict)
+        return _instruments.get(alias)
+
+
+SLOW_QUERY_LOG_INSTRUMENT = 'OpenEdge.pyodbc.slowlog.SlowQueryLog'
+
+
+def load_instrument(alias, settings_dict):
+    spec = settings_dict.get('INSTRUMENTATION') or []
+    if spec is True:
+        spec = ['OpenEdge.pyodbc.instrumentation.StatementStats']
+    elif isinstance(spec, basestring):
+        spec = [spec]
+    if settings_dict.get('SLOW_QUERY_LOG') and SLOW_QUERY_LOG_INSTRUMENT not in spec:
+        spec = list(spec) + [SLOW_QUERY_LOG_INSTRUMENT]
+    if not spec:
+        return None
+
+    instruments = []
+    for path in spec:
+        module, attr = path.rsplit('.', 1)
+        try:
+            cls = getattr(import_module(module), attr)
+        except (ImportError, AttributeError), e:
+            raise ImproperlyConfigured('Error loading OpenEdge instrument %s: %s' % (path, e))
+        instruments.append(cls(alias, settings_dict))
+    if len(instruments) == 1:
+        return instruments[0]
+    return InstrumentChain(instruments)
+
+
+class Instrument(object):
+    """
+    Base class of the instruments, it receives the measures of the statements.
+        sql : raw SQL of the statement (as given to the cursor)
+        operation : 'execute', 'executemany' or 'fetch'
+        params : encoded parameters (None for a fetch)
+        rows : rows fetched, or parameter sets of an executemany
+        driver_time : seconds spent in pyodbc
+        transform_time : seconds spent in the wrapper
+        transcoded : bytes of the encoded parameters or the decoded columns
+        error : the statement failed
+    """
+    def __init__(self, alias, settings_dict):
+        self.alias = alias
+        self._fingerprints = get_cache('fingerprints', alias, 1000)
+
+    def fingerprint(self, sql):
+        fp = self._fingerprints.get(sql)
+        if fp is None:
+            fp = fingerprint(sql)
+            self._fingerprints.put(sql, fp)
+        return fp
+
+    def record(self, sql, operation, params, rows, driver_time, transform_time, transcoded, error=False):
+        pass
+
+
+class InstrumentChain(Instrument):
+    """
+    Sends the measures to several instruments.
+    """
+    def __init__(self, instruments):
+        self.instruments = instruments
+
+    def record(self, *args, **kwargs):
+        for instrument in self.instruments:
+            instrument.record(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        # stats(), top()... of the first instrument having them
+        for instrument in self.instruments:
+            if hasattr(instrument, attr):
+                return getattr(instrument, attr)
+        raise AttributeError(attr)
+
+
+class StatementStats(Instrument):
+    """
+    Statistics and wall time histograms of the statements, by fingerprint.
+    The fetches are counted in the statement they read.
+    """
+    # Fingerprints kept, the others are counted together
+    MAX_FINGERPRINTS = 1000
+    OTHERS = '<others>'
+
+    def __init__(self, alias, settings_dict):
+        super(StatementStats, self).__init__(alias, settings_dict)
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _new_entry(self):
+        return {
+            'count': 0,
+            'executemany': 0,
+            'fetches': 0,
+            'errors': 0,
+            'total_time': 0.0,
+            'driver_time': 0.0,
+            'transform_time': 0.0,
+            'max_time': 0.0,
+            'rows': 0,
+            'transcoded': 0,
+            'histogram': [0] * (len(HISTOGRAM_BOUNDS) + 1),
+        }
+
+    def record(self, sql, operation, params, rows, driver_time, transform_time, transcoded, error=False):
+        fp = self.fingerprint(sql)
+        elapsed = driver_time + transform_time
+        with self._lock:
+            entry = self._stats.get(fp)
+            if entry is None:
+                if len(self._stats) >= self.MAX_FINGERPRINTS:
+                    fp = self.OTHERS
+                entry = self._stats.setdefault(fp, self._new_entry())
+            if operation == 'fetch':
+                entry['fetches'] += 1
+            else:
+                entry['count'] += 1
+                if operation == 'executemany':
+                    entry['executemany'] += 1
+                if error:
+                    entry['errors'] += 1
+                entry['histogram'][bisect.bisect_left(HISTOGRAM_BOUNDS, elapsed)] += 1
+                entry['max_time'] = max(entry['max_time'], elapsed)
+            entry['total_time'] += elapsed
+            entry['driver_time'] += driver_time
+            entry['transform_time'] += transform_time
+            entry['rows'] += rows
+            entry['transcoded'] += transcoded
+
+    def stats(self):
+        """
+        Returns a copy of the statistics, by fingerprint. The histogram counts
+        the statements by wall time, bucket i is up to HISTOGRAM_BOUNDS[i]
+        seconds and the last one is above.
+        """
+        with self._lock:
+            return dict([(fp, dict(entry, histogram=list(entry['histogram'])))
+                         for fp, entry in self._stats.iteritems()])
+
+    def top(self, count=10, key='total_time'):
+        """
+        Returns the (fingerprint, stats) of the count statements with the
+        highest key.
+        """
+        stats = self.stats().items()
+        stats.sort(key=lambda item: item[1][key], reverse=True)
+        return stats[:count]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
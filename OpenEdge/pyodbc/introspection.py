@@ -1,6 +1,7 @@
 from django.db.backends import BaseDatabaseIntrospection
 import pyodbc as Database
 import decimal,datetime
+from OpenEdge.pyodbc.names import physical_name, model_names
 
 SQL_AUTOFIELD = -777555
 
@@ -22,7 +23,7 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
 
         The default table name converter is for case sensitive comparison.
         """
-        return name[:32]
+        return physical_name(name)
     
     def installed_models(self, tables):
         "Returns a set of all models represented by the provided list of table names."
@@ -36,7 +37,7 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
         
         return set([
             m for m in all_models
-            if self.table_name_converter(m._meta.db_table)[:32] in tables
+            if model_names(m).table in tables
         ])
             
     def get_table_list(self, cursor):
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+CSV loader of the OpenEdge backend.
+
+The file is split in byte ranges ending at line boundaries, one range per
+worker thread. Each worker reads its range with the csv module, converts the
+values with the fields of the model and sends them with executemany by
+batches, on its own connection in bulk-load mode (see OpenEdge.pyodbc.bulkload)
+and with the array binding of pyodbc (FAST_EXECUTEMANY). When the table has an
+id column not given by the file, the ids of a batch are allocated from the
+sequence of the table by blocks of the batch size.
+
+The columns of the file are matched to the fields by the first line of the
+file : field name, attribute name (ie: customer_id) or column name. A column
+mapped to '' is ignored. A record must not span lines (no newline in the
+quoted values).
+
+    loader = CsvLoader(Item, 'items.csv', workers=4, batch_size=2000)
+    report = loader.load()
+
+    python manage.py oe_loadcsv shop.Item items.csv --workers 4
+
+With dry_run, the file is read and converted without connecting to the
+database, the report gives the throughput of the reading and conversion.
+'''
+
+import csv
+import os
+import sys
+import threading
+import time
+
+from django.core.exceptions import ValidationError
+from django.db import connections, DEFAULT_DB_ALIAS
+
+from OpenEdge.pyodbc.names import model_names
+from OpenEdge.pyodbc.sequences import get_allocator, block_size
+from OpenEdge.pyodbc.streaming import slices
+
+
+class LoadError(Exception):
+    pass
+
+
+def read_header(path, delimiter=',', encoding='utf-8'):
+    """
+    Returns the column names of the first line of a file and the offset of
+    the second line.
+    """
+    with open(path, 'rb') as f:
+        line = f.readline()
+    names = csv.reader([line], delimiter=delimiter).next() if line.strip() else []
+    return [name.decode(encoding).strip() for name in names], len(line)
+
+
+def byte_ranges(path, count, start=0):
+    """
+    Splits a file from start in count (start, end) byte ranges, each range
+    ends at a line boundary.
+    """
+    size = os.path.getsize(path)
+    bounds = [start]
+    with open(path, 'rb') as f:
+        for i in xrange(1, count):
+            position = start + (size - start) * i // count
+            if position <= bounds[-1]:
+                continue
+            # The range ends after the line containing the byte before position
+            f.seek(position - 1)
+            f.readline()
+            bounds.append(min(f.tell(), size))
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def read_range(path, start, end, delimiter=',', encoding='utf-8'):
+    """
+    Yields the records of the lines of a file starting in [start, end).
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+
+        def lines():
+            position = start
+            while position < end:
+                line = f.readline()
+                if not line:
+                    return
+                position += len(line)
+                yield line
+
+        for record in csv.reader(lines(), delimiter=delimiter):
+            if record:
+                yield [value.decode(encoding) for value in record]
+
+
+class CsvMapping(object):
+    """
+    Fields of a model given by the columns of a file. columns maps the
+    column names of the file to field names, the other columns are matched by
+    name.
+    """
+    def __init__(self, model, header, columns=None):
+        opts = model._meta
+        columns = columns or {}
+        by_name = {}
+        for field in opts.local_fields:
+            for name in (field.column, field.attname, field.name):
+                by_name[name] = field
+
+        self.indexes = []
+        unknown = []
+        for i, name in enumerate(header):
+            name = columns.get(name, name)
+            if not name:
+                continue
+            field = by_name.get(name)
+            if field is None:
+                unknown.append(name)
+            else:
+                self.indexes.append((i, field))
+        if unknown:
+            raise LoadError('Columns not found in %s: %s' % (model.__name__, ', '.join(unknown)))
+        self.fields = [field for i, field in self.indexes]
+
+    def convert(self, record, connection):
+        """
+        Returns the parameters of a record.
+        """
+        values = []
+        for i, field in self.indexes:
+            value = record[i]
+            if value == '' and (field.null or not field.empty_strings_allowed):
+                value = None
+            else:
+                value = field.to_python(value)
+            values.append(field.get_db_prep_save(value, connection=connection))
+        return values
+
+
+class CsvLoader(object):
+    """
+    Loads a CSV file in the table of a model, see the module documentation.
+    progress(rows) is called with the total count of rows after each batch.
+    """
+    def __init__(self, model, path, using=DEFAULT_DB_ALIAS, workers=4, batch_size=1000, columns=None,
+                 delimiter=',', encoding='utf-8', fast_executemany=True, drop_indexes=False, progress=None):
+        self.model = model
+        self.path = path
+        self.using = using
+        self.workers = max(workers, 1)
+        self.batch_size = batch_size
+        self.delimiter = delimiter
+        self.encoding = encoding
+        self.fast_executemany = fast_executemany
+        self.drop_indexes = drop_indexes
+        self.progress = progress
+
+        header, self.data_start = read_header(path, delimiter, encoding)
+        self.mapping = CsvMapping(model, header, columns)
+        self.names = model_names(model)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._failures = []
+        self.rows = 0
+
+    def insert_sql(self, add_id):
+        columns = self.names.column_list(self.mapping.fields)
+        placeholders = ['%s'] * len(self.mapping.fields)
+        if add_id:
+            columns += ', "id"'
+            placeholders.append('%s')
+        return 'INSERT INTO %s (%s) VALUES (%s)' % (self.names.qtable, columns, ', '.join(placeholders))
+
+    def load(self, dry_run=False):
+        """
+        Loads the file, returns the report : rows, seconds, rows_per_second,
+        statements, errors and the report of each range.
+        """
+        started = time.time()
+        ranges = byte_ranges(self.path, self.workers, self.data_start)
+        reports = [{'start': start, 'end': end, 'rows': 0, 'statements': 0, 'errors': 0, 'seconds': 0.0}
+                   for start, end in ranges]
+
+        if dry_run:
+            self._run(reports, self._convert_range)
+        else:
+            db = connections[self.using]
+            cursor = db.cursor()
+            mapped = [field.column for field in self.mapping.fields]
+            add_id = 'id' not in mapped and db.ops.has_id_col(self.names.table, cursor, db.owner)
+            sql = self.insert_sql(add_id)
+            if self.drop_indexes:
+                # The indexes are dropped and restored once, around the workers
+                with db.bulk_load(self.model, drop_indexes=True):
+                    self._run(reports, self._load_range, sql, add_id)
+            else:
+                self._run(reports, self._load_range, sql, add_id)
+
+        seconds = time.time() - started
+        rows = sum([report['rows'] for report in reports])
+        return {'rows': rows, 'seconds': seconds, 'rows_per_second': rows / max(seconds, 0.001),
+                'statements': sum([report['statements'] for report in reports]),
+                'errors': sum([report['errors'] for report in reports]),
+                'ranges': reports}
+
+    def _run(self, reports, target, *args):
+        """
+        Runs target(report, *args) for each range on a worker thread, the first
+        failure of a worker stops the others and is raised again.
+        """
+        threads = [threading.Thread(target=self._worker, args=(target, report) + args,
+                                    name='OpenEdge loader %d' % i)
+                   for i, report in enumerate(reports)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if self._failures:
+            exc_info = self._failures[0]
+            raise exc_info[0], exc_info[1], exc_info[2]
+
+    def _worker(self, target, report, *args):
+        started = time.time()
+        try:
+            target(report, *args)
+        except Exception:
+            self._stopped.set()
+            self._failures.append(sys.exc_info())
+        report['seconds'] = time.time() - started
+
+    def _batches(self, report):
+        records = read_range(self.path, report['start'], report['end'], self.delimiter, self.encoding)
+        for batch in slices(records, self.batch_size):
+            if self._stopped.is_set():
+                return
+            yield batch
+
+    def _convert(self, record, count, report, connection):
+        try:
+            return self.mapping.convert(record, connection)
+        except (ValidationError, ValueError, TypeError, IndexError), e:
+            raise LoadError('Record %d of the range at byte %d: %s' % (count + 1, report['start'], e))
+
+    def _added(self, report, rows):
+        report['rows'] += rows
+        report['statements'] += 1
+        with self._lock:
+            self.rows += rows
+            total = self.rows
+        if self.progress is not None:
+            self.progress(total)
+
+    def _convert_range(self, report):
+        connection = connections[self.using]
+        count = 0
+        for batch in self._batches(report):
+            converted = 0
+            for record in batch:
+                try:
+                    self._convert(record, count, report, connection)
+                    converted += 1
+                except LoadError:
+                    report['errors'] += 1
+                count += 1
+            self._added(report, converted)
+
+    def _load_range(self, report, sql, add_id):
+        db = connections[self.using]
+        db.fast_executemany = self.fast_executemany
+        try:
+            with db.bulk_load():
+                cursor = db.cursor()
+                allocator = get_allocator(self.using, self.names.sequence, db.ops.dual_table())
+                block = max(self.batch_size, block_size(db.settings_dict, self.names.table))
+                count = 0
+                for batch in self._batches(report):
+                    rows = []
+                    for record in batch:
+                        rows.append(self._convert(record, count, report, db))
+                        count += 1
+                    if add_id:
+                        for row, value in zip(rows, allocator.allocate(len(rows), cursor, block)):
+                            row.append(value)
+                    cursor.executemany(sql, rows)
+                    self._added(report, len(rows))
+        finally:
+            db.close()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+OpenEdge names of the models.
+
+OpenEdge table and column names are limited to 32 characters. The physical
+names of a model (table, columns, id sequence) and their quoted fragments are
+computed once, when the model class is prepared, instead of truncating the
+Django names in each query. The names of the models prepared before this module
+is loaded are computed on their first use.
+
+Two columns of a model, or two tables, truncated to the same OpenEdge name
+raise a warning when the names are computed.
+'''
+
+import threading
+import warnings
+
+from django.db.models.signals import class_prepared
+
+MAX_NAME_LENGTH = 32
+# id_<table> sequences emulating the auto increment
+SEQUENCE_PREFIX = 'id_'
+
+_names = {}
+_tables = {}
+_names_lock = threading.Lock()
+
+
+def physical_name(name, max_len=MAX_NAME_LENGTH):
+    """
+    Returns the OpenEdge name of a Django table or column name.
+    """
+    return name[:max_len]
+
+
+def quote(name):
+    if name.startswith('"') and name.endswith('"'):
+        return name
+    return '"%s"' % name
+
+
+class ModelNames(object):
+    """
+    Physical names of a model :
+        table, qtable : table name, quoted
+        columns, qcolumns : names of the columns by Django column, quoted
+        sequence : sequence of the id column
+        has_id : the model has an id column
+    """
+    def __init__(self, model):
+        opts = model._meta
+        self.model = model
+        self.table = physical_name(opts.db_table)
+        self.qtable = quote(self.table)
+        self.columns = {}
+        self.qcolumns = {}
+        for field in opts.local_fields:
+            if field.column:
+                self.columns[field.column] = physical_name(field.column)
+                self.qcolumns[field.column] = quote(self.columns[field.column])
+        self.has_id = 'id' in self.columns.values()
+        self.sequence = SEQUENCE_PREFIX + opts.db_table[:MAX_NAME_LENGTH - len(SEQUENCE_PREFIX)]
+
+    def column_list(self, fields):
+        """
+        Returns the quoted column list of the fields, ie: '"name", "qty"'.
+        """
+        return ', '.join([self.qcolumns.get(f.column) or quote(physical_name(f.column)) for f in fields])
+
+    def check(self):
+        """
+        Warns about the columns having the same OpenEdge name.
+        """
+        seen = {}
+        for column, name in self.columns.items():
+            if name in seen and seen[name] != column:
+                warnings.warn('%s: the columns %s and %s are both named %s in OpenEdge'
+                              % (self.model.__name__, seen[name], column, name))
+            seen[name] = column
+
+
+def model_names(model):
+    """
+    Returns the ModelNames of a model.
+    """
+    try:
+        return _names[model]
+    except KeyError:
+        return prepare_names(model)
+
+
+def table_names(table):
+    """
+    Returns the ModelNames of the model of an OpenEdge table name, None if no
+    model is prepared for this table.
+    """
+    model = _tables.get(table)
+    if model is None:
+        return None
+    return model_names(model)
+
+
+def prepare_names(model):
+    names = ModelNames(model)
+    names.check()
+    with _names_lock:
+        opts = model._meta
+        other = _tables.get(names.table)
+        if (other is not None and other is not model and other._meta.db_table != opts.db_table
+                and opts.managed and not opts.proxy):
+            warnings.warn('The tables of %s and %s are both named %s in OpenEdge'
+                          % (other.__name__, model.__name__, names.table))
+        _tables.setdefault(names.table, model)
+        _names[model] = names
+    return names
+
+
+def _class_prepared(sender, **kwargs):
+    prepare_names(sender)
+
+class_prepared.connect(_class_prepared, dispatch_uid='OpenEdge.pyodbc.names')
@@ -15,10 +15,18 @@ Created on 16 mai 2013
 
 from django.db.backends import BaseDatabaseOperations
 from OpenEdge.pyodbc import query
+from OpenEdge.pyodbc.names import physical_name, model_names, table_names, MAX_NAME_LENGTH
+from OpenEdge.pyodbc.catalog import get_catalog
+from OpenEdge.pyodbc.sequences import get_allocator, block_size, invalidate_allocators
 import datetime
+import re
 import time
 import decimal
 
+# Default limits of a statement (MAX_STATEMENT_LENGTH and MAX_QUERY_PARAMS keys of the database settings)
+MAX_STATEMENT_LENGTH = 131072
+MAX_QUERY_PARAMS = 512
+
 class DatabaseOperations(BaseDatabaseOperations):
     compiler_module = "OpenEdge.pyodbc.compiler"
     
@@ -27,10 +35,17 @@ class DatabaseOperations(BaseDatabaseOperations):
         super(DatabaseOperations, self).__init__(connection)
         self.connection = connection
         self._ss_ver = None
+        self._oe_version = None
         self.MAX_TABLE_NAME=self.max_name_length()
         self.MAX_INDEX_NAME=self.MAX_TABLE_NAME - 2
         self.MAX_CONSTRAINT_NAME=self.max_name_length()
         self.MAX_SEQNAME=self.MAX_TABLE_NAME - 3
+        #=======================================================================
+        # OpenEdge SQL limits of a statement, they size the multi-row inserts
+        #=======================================================================
+        settings_dict = getattr(connection, 'settings_dict', {})
+        self.MAX_STATEMENT_LENGTH = settings_dict.get('MAX_STATEMENT_LENGTH', MAX_STATEMENT_LENGTH)
+        self.MAX_QUERY_PARAMS = settings_dict.get('MAX_QUERY_PARAMS', MAX_QUERY_PARAMS)
         
 
     def date_extract_sql(self, lookup_type, field_name):
@@ -131,12 +146,14 @@ class DatabaseOperations(BaseDatabaseOperations):
         """
         
         if tables:
+            # The values kept for the id sequences are dropped with the rows
+            invalidate_allocators(getattr(self.connection, 'alias', 'default'), names=tables)
             # Oracle does support TRUNCATE, but it seems to get us into
             # FK referential trouble, whereas DELETE FROM table works.
             sql = ['%s %s %s;' % \
                     (style.SQL_KEYWORD('DELETE'),
                      style.SQL_KEYWORD('FROM'),
-                     style.SQL_FIELD(self.quote_name(table[:self.MAX_TABLE_NAME])))
+                     style.SQL_FIELD(self.quoted_table(table)))
                     for table in tables]
             # Since we've just deleted all the rows, running our sequence
             # ALTER code will reset the sequence to 0.
@@ -317,11 +334,33 @@ class DatabaseOperations(BaseDatabaseOperations):
         return "VALUES %s"%items_sql
         #items_sql = "(%s)" % ", ".join(["%s"] * (len(fields)+OEid))
         #return "VALUES " + ", ".join([items_sql] * num_values)
-    
-        #==================ORACLE=====================================================
-        # items_sql = "SELECT %s FROM DUAL" % ", ".join(["%s"] * len(fields))
-        # return " UNION ALL ".join([items_sql] * num_values)
-        #=======================================================================
+
+    def dual_table(self):
+        """
+        Returns the qualified DUAL table of the schema (DUALTABLE setting).
+        """
+        config = self.connection.get_session_config()
+        return '"%s"."%s"' % (config.defschema, config.dual)
+
+    def union_insert_sql(self, casts, num_values):
+        """
+        Returns the rows of a multi-row insert selected from the DUAL table :
+            SELECT CAST(%s AS int), ... FROM "PUB"."DUAL" UNION ALL SELECT ...
+        casts are the placeholders of the columns.
+        """
+        items_sql = 'SELECT %s FROM %s' % (", ".join(casts), self.dual_table())
+        return " UNION ALL ".join([items_sql] * num_values)
+
+    def union_batch_size(self, casts, head_length):
+        """
+        Returns the number of rows of a multi-row insert, bounded by the
+        statement length and parameter count limits. head_length is the length
+        of the INSERT INTO ... (columns) part.
+        """
+        item_length = len(self.union_insert_sql(casts, 1)) + len(" UNION ALL ")
+        by_length = (self.MAX_STATEMENT_LENGTH - head_length) // item_length
+        by_params = self.MAX_QUERY_PARAMS // max(len(casts), 1)
+        return max(min(by_length, by_params), 1)
     
         #==================SQLITE=====================================================
         # res = []
@@ -337,8 +376,54 @@ class DatabaseOperations(BaseDatabaseOperations):
         Returns the maximum length of table and column names, or None if there
         is no limit.
         """
-        return 32
+        return MAX_NAME_LENGTH
     
+    def oe_version(self):
+        """
+        Returns the OpenEdge version (major, minor), from the OEVERSION key of the
+        database settings or from the driver (SQL_DBMS_VER). (0, 0) if unknown.
+        """
+        if self._oe_version is None:
+            version = self.connection.settings_dict.get('OEVERSION')
+            if version is None:
+                if self.connection.connection is None:
+                    self.connection.cursor()
+                try:
+                    from pyodbc import SQL_DBMS_VER
+                    version = self.connection.connection.getinfo(SQL_DBMS_VER)
+                except Exception:
+                    version = ''
+            if isinstance(version, (tuple, list)):
+                self._oe_version = tuple(version[:2])
+            else:
+                m = re.search(r'(\d+)\.(\d+)', str(version))
+                self._oe_version = m and (int(m.group(1)), int(m.group(2))) or (0, 0)
+        return self._oe_version
+
+    def supports_offset_fetch(self):
+        """
+        OFFSET n ROWS FETCH NEXT m ROWS ONLY is available since OpenEdge 11.2
+        """
+        return self.oe_version() >= (11, 2)
+
+    def quoted_table(self, table):
+        """
+        Returns the quoted OpenEdge name of a Django table name.
+        """
+        names = table_names(physical_name(table))
+        if names is not None:
+            return names.qtable
+        return self.quote_name(physical_name(table))
+
+    def sequence_reset_sql(self, style, model_list):
+        """
+        The id sequences are not reset, the values kept by the process for
+        the models are dropped (see OpenEdge.pyodbc.sequences).
+        """
+        invalidate_allocators(getattr(self.connection, 'alias', 'default'),
+                              names=[model_names(model).sequence for model in model_list])
+        return []
+
     def autoinc_sql(self, table, column):
         """
         Returns any SQL needed to support auto-incrementing primary keys, or
@@ -356,17 +441,47 @@ class DatabaseOperations(BaseDatabaseOperations):
         Returns the next value of the sequence associate to the table.
         
         """
-        cursor.execute('select id_%s.nextval from dual'%table[:max_len-3])
-        return cursor.fetchone()[0]   
+        return self.get_autoinc_keyvals(table, column, max_len, cursor, 1)[0]
+        #=======================================================================
+        # cursor.execute('select id_%s.nextval from dual'%table[:max_len-3])
+        # return cursor.fetchone()[0]   
+        #=======================================================================
+
+    def get_autoinc_keyvals(self, table, column, max_len, cursor, count):
+        """
+        Returns count values of the sequence associate to the table, they are
+        allocated by blocks (see OpenEdge.pyodbc.sequences).
+        """
+        names = table_names(physical_name(table))
+        sequence = names is not None and names.sequence or 'id_%s' % table[:max_len-3]
+        allocator = get_allocator(getattr(self.connection, 'alias', 'default'), sequence, self.dual_table())
+        return allocator.allocate(count, cursor, block_size(self.connection.settings_dict, table))
 
     def has_id_col(self, table, cursor, owner):
         """
-        Return true if the table have an ID column        
+        Return true if the table have an ID column, from the catalog cache
+        (see OpenEdge.pyodbc.catalog). The table of a model with an id field
+        has one.
         """
-        if len(cursor.execute("select col from sysprogress.syscolumns where tbl = '%s' and owner = '%s' and col = 'id'"%(table,owner)).fetchall()) > 0 :
+        names = table_names(table)
+        if names is not None and names.has_id:
             return True
-        else:
-            return False
+        catalog = get_catalog(getattr(self.connection, 'alias', 'default'), owner)
+        columns = catalog.cached_columns(table)
+        if columns is None:
+            # The catalog queries use the '?' placeholders of a pyodbc cursor
+            raw = self.connection.connection.cursor()
+            try:
+                columns = catalog.columns(table, raw)
+            finally:
+                raw.close()
+        return 'id' in columns
+        #=======================================================================
+        # if len(cursor.execute("select col from sysprogress.syscolumns where tbl = '%s' and owner = '%s' and col = 'id'"%(table,owner)).fetchall()) > 0 :
+        #     return True
+        # else:
+        #     return False
+        #=======================================================================
     
     
     
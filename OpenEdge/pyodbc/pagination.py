@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Keyset (seek) pagination of the OpenEdge backend.
+
+A page is read after the ordering key of the last row of the previous page,
+instead of skipping the rows of the previous pages : the condition
+(k1, k2) > (v1, v2), not supported by OpenEdge, is expanded in
+
+    k1 >= v1 AND (k1 > v1 OR (k1 = v1 AND k2 > v2))
+
+and the page size is a TOP, so each page costs the same whatever its depth.
+The leading k1 >= v1 gives the index range to the server.
+
+The key is the ordering of the queryset (or the keys argument), completed with
+the primary key when it is not unique. The key columns must not be NULL.
+
+    from OpenEdge.pyodbc.pagination import KeysetPaginator
+
+    paginator = KeysetPaginator(Order.objects.order_by('custnum', 'ordernum'), 100)
+    page = paginator.page()
+    while page:
+        ...
+        page = paginator.page(page.next_key)
+
+    for order in keyset_iter(Order.objects.all(), 1000):
+        ...
+'''
+
+from django.db.models import Q
+
+
+class Page(list):
+    """
+    Rows of a page, with the key to read the next page.
+    """
+    def __init__(self, rows, next_key, has_next):
+        super(Page, self).__init__(rows)
+        self.next_key = next_key
+        self.has_next = has_next
+
+
+def keyset_q(keys, values):
+    """
+    Returns the Q selecting the rows after values, keys is a list of
+    (field name, descending).
+    """
+    for (name, descending), value in zip(keys, values):
+        if value is None:
+            raise ValueError('The keyset column %s is NULL' % name)
+
+    after = None
+    for i, (name, descending) in enumerate(keys):
+        term = Q(**{'%s__%s' % (name, descending and 'lt' or 'gt'): values[i]})
+        for (prev, _), value in zip(keys[:i], values[:i]):
+            term &= Q(**{prev: value})
+        after = term if after is None else after | term
+
+    name, descending = keys[0]
+    return Q(**{'%s__%s' % (name, descending and 'lte' or 'gte'): values[0]}) & after
+
+
+class KeysetPaginator(object):
+    """
+    Reads the pages of a queryset by keyset. The rows are model instances
+    or values() dicts.
+    """
+    def __init__(self, queryset, per_page=100, keys=None):
+        self.per_page = per_page
+        self.model = queryset.model
+        self.keys = self.unique_keys(keys or self.queryset_ordering(queryset))
+        self.queryset = queryset.order_by(*[(desc and '-' or '') + name for name, desc in self.keys])
+
+        fields = dict([(f.name, f) for f in self.model._meta.fields])
+        self.attnames = [fields[name].attname for name, desc in self.keys]
+
+    def queryset_ordering(self, queryset):
+        query = queryset.query
+        if query.order_by:
+            return query.order_by
+        if query.default_ordering:
+            return self.model._meta.ordering
+        return []
+
+    def unique_keys(self, ordering):
+        """
+        Returns the (field name, descending) of the ordering, the primary key
+        is added when the ordering columns are not unique.
+        """
+        opts = self.model._meta
+        keys = []
+        for name in ordering:
+            desc = name.startswith('-')
+            name = name.lstrip('-+')
+            if name == 'pk':
+                name = opts.pk.name
+            if '__' in name or name == '?' or '.' in name:
+                raise ValueError('Keyset pagination needs local field orderings, not %s' % name)
+            field = opts.get_field(name)
+            keys.append((field.name, desc))
+
+        names = set([name for name, desc in keys])
+        unique = opts.pk.name in names
+        unique = unique or any([f.unique for f in opts.fields if f.name in names])
+        unique = unique or any([set(fields) <= names for fields in opts.unique_together])
+        if not unique:
+            keys.append((opts.pk.name, keys and keys[-1][1] or False))
+        return keys
+
+    def key(self, row):
+        """
+        Returns the key values of a row.
+        """
+        if isinstance(row, dict):
+            return tuple([row[name] for name, desc in self.keys])
+        return tuple([getattr(row, attname) for attname in self.attnames])
+
+    def page(self, after=None):
+        """
+        Returns the page following the key after, or the first page.
+        """
+        queryset = self.queryset
+        if after is not None:
+            queryset = queryset.filter(keyset_q(self.keys, after))
+        rows = list(queryset[:self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        next_key = rows and self.key(rows[-1]) or None
+        return Page(rows, next_key, has_next)
+
+    def __iter__(self):
+        """
+        Yields the pages.
+        """
+        page = self.page()
+        while page:
+            yield page
+            if not page.has_next:
+                break
+            page = self.page(page.next_key)
+
+
+def keyset_iter(queryset, per_page=1000, keys=None):
+    """
+    Yields the rows of a queryset, read by keyset pages of per_page rows.
+    """
+    for page in KeysetPaginator(queryset, per_page, keys):
+        for row in page:
+            yield row
@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Key range partitions of the OpenEdge tables.
+
+A queryset is split in count ranges of a key, so the ranges can be read at the
+same time on several connections. The key is the primary key when it leads an
+index of the table, otherwise the leading column of a unique index, then of
+any index, found in the SYSPROGRESS catalog (see OpenEdge.pyodbc.catalog).
+
+The ranges of an integer key are computed from its minimum and maximum, the
+ranges of the other keys from the values found at regular offsets of the
+ordered queryset. The rows with a NULL key are given by the last partition.
+
+    queryset = Order.objects.all()
+    for partition in partitions(queryset, 4):
+        rows = partition.filter(queryset)
+        nulls = partition.null_rows(queryset)
+
+The partitions of a queryset can be read at the same time by a pool of threads
+or processes, each with its own connection. The filters of the queryset apply
+to each partition. parallel_iter() yields the rows in no particular order,
+partition_map() runs a function on the rows of each partition and combines the
+results :
+
+    for order in parallel_iter(Order.objects.filter(status='open'), 8):
+        ...
+
+    total = partition_map(Order.objects.values_list('amount', flat=True), sum,
+                          operator.add, 8, processes=True)
+
+With processes, the function must be picklable (a module level function) and
+the rows of a partition are returned as a list by the child process, with
+threads they are streamed by blocks of chunk_size rows (in memory with
+CHUNKED_READS, see OpenEdge.pyodbc.streaming).
+'''
+
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+import Queue
+import sys
+import threading
+
+from django.db import connections
+from django.db.models import Q, Min, Max
+from django.db.models.query import QuerySet
+
+from OpenEdge.pyodbc.catalog import get_catalog
+from OpenEdge.pyodbc.names import model_names
+from OpenEdge.pyodbc.pool import forget_pools
+from OpenEdge.pyodbc.streaming import slices, stream
+
+INTEGER_FIELDS = ('AutoField', 'IntegerField', 'BigIntegerField', 'SmallIntegerField',
+                  'PositiveIntegerField', 'PositiveSmallIntegerField')
+
+
+class Partition(object):
+    """
+    Range low <= key < high of a key, low or high is None for an open range.
+    The rows with a NULL key belong to the partition when nulls is set.
+    """
+    def __init__(self, key, low, high, nulls=False):
+        self.key = key
+        self.low = low
+        self.high = high
+        self.nulls = nulls
+
+    def q(self):
+        q = Q()
+        if self.low is not None:
+            q &= Q(**{'%s__gte' % self.key: self.low})
+        if self.high is not None:
+            q &= Q(**{'%s__lt' % self.key: self.high})
+        if self.low is None and self.high is None:
+            q &= Q(**{'%s__isnull' % self.key: False})
+        return q
+
+    def filter(self, queryset):
+        """
+        Returns the rows of the range, ordered by key.
+        """
+        return queryset.filter(self.q()).order_by(self.key)
+
+    def null_rows(self, queryset):
+        """
+        Returns the rows with a NULL key, ordered by primary key, or None.
+        """
+        if not self.nulls:
+            return None
+        return queryset.filter(**{'%s__isnull' % self.key: True}).order_by('pk')
+
+    def __repr__(self):
+        return '<Partition %s [%r, %r)>' % (self.key, self.low, self.high)
+
+
+def partition_key(model, using):
+    """
+    Returns the name of the field used to split the table of a model.
+    """
+    opts = model._meta
+    names = model_names(model)
+    db = connections[using]
+    if db.connection is None:
+        db.cursor()
+    catalog = get_catalog(getattr(db, 'alias', 'default'), db.owner)
+    # The catalog queries use the '?' placeholders of a pyodbc cursor
+    raw = db.connection.cursor()
+    try:
+        indexes = catalog.indexes(names.table, raw)
+    finally:
+        raw.close()
+
+    fields = dict([(names.columns.get(f.column), f) for f in opts.local_fields if f.column])
+    leading = [(not index['unique'], name, fields.get(index['columns'][0]))
+               for name, index in indexes.items() if index['columns']]
+    leading = [(not_unique, name, field) for not_unique, name, field in sorted(leading) if field is not None]
+    if any([field is opts.pk for not_unique, name, field in leading]) or not leading:
+        return opts.pk.name
+    return leading[0][2].name
+
+
+def partitions(queryset, count, key=None):
+    """
+    Returns the Partitions splitting a queryset in count ranges of key (see
+    partition_key by default).
+    """
+    model = queryset.model
+    key = key or partition_key(model, queryset.db)
+    field = model._meta.get_field(key)
+    count = max(count, 1)
+
+    # The bounds are read with a plain queryset, values() masks the aggregates
+    queryset = queryset._clone(klass=QuerySet, setup=False)
+    queryset.query.set_aggregate_mask(None)
+
+    if field.get_internal_type() in INTEGER_FIELDS:
+        bounds = queryset.aggregate(low=Min(key), high=Max(key))
+        low, high = bounds['low'], bounds['high']
+        if low is None:
+            return [Partition(key, None, None, nulls=True)]
+        step = max((high - low + 1) // count, 1)
+        boundaries = range(low + step, high + 1, step)[:count - 1]
+    else:
+        ordered = queryset.exclude(**{'%s__isnull' % key: True}).order_by(key).values_list(key, flat=True)
+        total = ordered.count()
+        boundaries = []
+        for i in xrange(1, count):
+            offset = total * i // count
+            if offset < total:
+                value = ordered[offset]
+                if value not in boundaries and (not boundaries or value > boundaries[-1]):
+                    boundaries.append(value)
+
+    lows = [None] + boundaries
+    highs = boundaries + [None]
+    result = [Partition(key, low, high) for low, high in zip(lows, highs)]
+    result[-1].nulls = field.null
+    return result
+
+
+def partition_querysets(queryset, count, key=None):
+    """
+    Returns the querysets of the partitions of a queryset, the rows with a
+    NULL key are the last one.
+    """
+    result = []
+    for partition in partitions(queryset, count, key):
+        result.append(partition.filter(queryset))
+        null_rows = partition.null_rows(queryset)
+        if null_rows is not None:
+            result.append(null_rows)
+    return result
+
+
+def _queryset_state(queryset):
+    """
+    Returns a picklable state of a queryset, without running it (a queryset
+    pickles its results).
+    """
+    state = queryset.__dict__.copy()
+    state['_result_cache'] = None
+    state['_iter'] = None
+    return queryset.__class__, state
+
+
+def _forget_connections():
+    """
+    Initializer of the child processes, the connections of the parent are not
+    used.
+    """
+    forget_pools()
+    for db in connections.all():
+        if hasattr(db, 'forget_connection'):
+            db.forget_connection()
+        else:
+            db.connection = None
+
+
+def _map_partition(task):
+    (cls, state), func = task
+    queryset = cls.__new__(cls)
+    queryset.__dict__.update(state)
+    try:
+        return func(stream(queryset))
+    finally:
+        connections[queryset.db].close()
+
+
+def _pool(workers, processes):
+    if processes:
+        return multiprocessing.Pool(workers, _forget_connections)
+    return ThreadPool(workers)
+
+
+def partition_map(queryset, func, combine=None, count=4, key=None, workers=None, processes=False):
+    """
+    Runs func(rows) on the rows of each partition of a queryset, on a pool of
+    workers threads or processes (count by default). Returns the results
+    combined with combine(result, result), or their list in the order of the
+    partitions.
+    """
+    return _run_partitions(partition_querysets(queryset, count, key), func, combine, workers, processes)
+
+
+def _run_partitions(querysets, func, combine=None, workers=None, processes=False):
+    """
+    Runs func(rows) on the rows of each queryset on a pool, see partition_map.
+    """
+    tasks = [(_queryset_state(qs), func) for qs in querysets]
+    pool = _pool(workers or len(tasks), processes)
+    try:
+        results = pool.map(_map_partition, tasks)
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+    if combine is None:
+        return results
+    return reduce(combine, results)
+
+
+# End of the rows, in the queue of parallel_iter
+_END = object()
+POLL_INTERVAL = 0.1
+
+
+def parallel_iter(queryset, count=4, key=None, workers=None, processes=False, chunk_size=1000):
+    """
+    Yields the rows of the partitions of a queryset, read at the same time on
+    a pool of workers threads or processes (count by default). At most two
+    blocks of chunk_size rows per worker wait to be consumed.
+    """
+    if processes:
+        for rows in partition_map(queryset, list, None, count, key, workers, processes):
+            for row in rows:
+                yield row
+        return
+
+    # The partitions are computed on the connection of the calling thread
+    querysets = partition_querysets(queryset, count, key)
+    queue = Queue.Queue(max(workers or len(querysets), 1) * 2)
+    stopped = threading.Event()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                queue.put(item, timeout=POLL_INTERVAL)
+                return True
+            except Queue.Full:
+                pass
+        return False
+
+    def push(rows):
+        for block in slices(rows, chunk_size):
+            if not put(block):
+                return
+
+    def run():
+        try:
+            _run_partitions(querysets, push, None, workers)
+        except Exception:
+            put(sys.exc_info())
+        put(_END)
+
+    thread = threading.Thread(target=run, name='OpenEdge parallel_iter')
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            item = queue.get()
+            if item is _END:
+                return
+            if isinstance(item, tuple):
+                raise item[0], item[1], item[2]
+            for row in item:
+                yield row
+    finally:
+        stopped.set()
+        while True:
+            try:
+                queue.get_nowait()
+            except Queue.Empty:
+                break
+        thread.join()
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Connection pool of the OpenEdge backend.
+
+The OpenEdge SQL servers accept a limited count of connections (-Mn/-Ma), so
+the physical connections are shared between the DatabaseWrapper of all the
+threads : a connection is checked out by _cursor() and returned to the pool by
+close() (ie: at the end of each request).
+
+The pool is enabled with the POOL key of the database settings :
+
+    DATABASES = {
+        'default': {
+            'ENGINE': 'OpenEdge.pyodbc',
+            ...
+            'POOL': {
+                'MIN_SIZE': 2,          # connections opened with the pool
+                'MAX_SIZE': 10,         # connections open at the same time
+                'TIMEOUT': 30,          # seconds to wait for a free connection
+                'MAX_LIFETIME': 3600,   # seconds before a connection is recycled
+                'MAX_IDLE': 600,        # seconds before an idle connection is closed
+                'PING_INTERVAL': 30,    # idle seconds before a ping on checkout
+            },
+        }
+    }
+'''
+
+import collections
+import threading
+import time
+
+from django.db.utils import DatabaseError
+
+from OpenEdge.pyodbc.session import SessionState
+
+POOL_DEFAULTS = {
+    'MIN_SIZE': 0,
+    'MAX_SIZE': 10,
+    'TIMEOUT': 30,
+    'MAX_LIFETIME': 3600,
+    'MAX_IDLE': 600,
+    'PING_INTERVAL': 30,
+}
+
+# Pools of the process, by (alias, connection string)
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, connstr, options, connect, ping_sql):
+    """
+    Returns the pool of this database alias, it is created on the first call.
+    """
+    key = (alias, connstr)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            conf = dict(POOL_DEFAULTS)
+            conf.update(options)
+            pool = ConnectionPool(connect, ping_sql,
+                                  min_size=conf['MIN_SIZE'],
+                                  max_size=conf['MAX_SIZE'],
+                                  timeout=conf['TIMEOUT'],
+                                  max_lifetime=conf['MAX_LIFETIME'],
+                                  max_idle=conf['MAX_IDLE'],
+                                  ping_interval=conf['PING_INTERVAL'])
+            _pools[key] = pool
+    return pool
+
+
+def forget_pools():
+    """
+    Forgets the pools of the process without closing their connections, ie: in
+    a child process, where the connections belong to the parent.
+    """
+    global _pools, _pools_lock
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+
+def pool_stats():
+    """
+    Returns the stats of all the pools of the process, by database alias.
+    """
+    with _pools_lock:
+        pools = _pools.items()
+    return dict([(alias, pool.stats()) for (alias, connstr), pool in pools])
+
+
+class PooledConnection(object):
+    """
+    A physical connection owned by a ConnectionPool, with its session state.
+    """
+    def __init__(self, connection):
+        self.connection = connection
+        self.session = SessionState()
+        self.created = time.time()
+        self.last_used = self.created
+        self.checked_out_at = None
+        self.uses = 0
+
+    def age(self, now):
+        return now - self.created
+
+    def idle(self, now):
+        return now - self.last_used
+
+
+class ConnectionPool(object):
+    """
+    Thread safe pool of pyodbc connections.
+    """
+    def __init__(self, connect, ping_sql, min_size=0, max_size=10, timeout=30,
+                 max_lifetime=3600, max_idle=600, ping_interval=30):
+        self.connect = connect
+        self.ping_sql = ping_sql
+        self.min_size = min_size
+        self.max_size = max(max_size, 1)
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.ping_interval = ping_interval
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = collections.deque()
+        # Open connections, idle or checked out, and connections being opened
+        self._size = 0
+
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+        self.opened = 0
+        self.closed = 0
+        self.pings = 0
+        self.ping_failures = 0
+        self.hold_time = 0.0
+        self.max_hold_time = 0.0
+        # Hold time of the last returned connections
+        self.hold_times = collections.deque(maxlen=1000)
+
+        for i in range(min(self.min_size, self.max_size)):
+            self._size += 1
+            self.checkin(self._open(), hold=False)
+
+    def _open(self):
+        try:
+            entry = PooledConnection(self.connect())
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self.opened += 1
+        return entry
+
+    def _discard(self, entry):
+        """
+        Closes the connection of an entry, the caller must hold the lock.
+        """
+        self._size -= 1
+        self.closed += 1
+        self._cond.notify()
+        try:
+            entry.connection.close()
+        except Exception:
+            pass
+
+    def _ping(self, entry):
+        """
+        Cheap liveness check of a connection, on the DUAL table.
+        """
+        try:
+            cursor = entry.connection.cursor()
+            cursor.execute(self.ping_sql).fetchall()
+            cursor.close()
+            alive = True
+        except Exception:
+            alive = False
+        with self._cond:
+            self.pings += 1
+            if not alive:
+                self.ping_failures += 1
+        return alive
+
+    def _evict(self, now):
+        """
+        Closes the expired and the too long idle connections, keeping at least
+        min_size open connections. The caller must hold the lock.
+        """
+        kept = collections.deque()
+        while self._idle:
+            entry = self._idle.popleft()
+            if entry.age(now) > self.max_lifetime or \
+               (entry.idle(now) > self.max_idle and self._size > self.min_size):
+                self._discard(entry)
+            else:
+                kept.append(entry)
+        self._idle = kept
+
+    def checkout(self, wait=True):
+        """
+        Returns a PooledConnection, waiting up to timeout seconds when all the
+        connections are in use, or returning None without wait.
+        """
+        start = time.time()
+        deadline = start + self.timeout
+        waited = False
+        with self._cond:
+            while True:
+                now = time.time()
+                self._evict(now)
+                if self._idle:
+                    # Most recently used first, the others age and are evicted
+                    entry = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    entry = None
+                    break
+                if not wait:
+                    return None
+                if now >= deadline:
+                    self.timeouts += 1
+                    if waited:
+                        self.wait_time += now - start
+                    raise DatabaseError('OpenEdge connection pool exhausted (%d connections in use for %.1f seconds)'
+                                        % (self._size, now - start))
+                if not waited:
+                    waited = True
+                    self.waits += 1
+                self._cond.wait(deadline - now)
+            if waited:
+                self.wait_time += time.time() - start
+
+        if entry is None:
+            entry = self._open()
+        elif entry.idle(time.time()) > self.ping_interval and not self._ping(entry):
+            with self._cond:
+                self._discard(entry)
+            return self.checkout(wait)
+
+        entry.checked_out_at = time.time()
+        entry.uses += 1
+        with self._cond:
+            self.checkouts += 1
+        return entry
+
+    def checkin(self, entry, hold=True, discard=False):
+        """
+        Returns a connection to the pool. Its pending work is rolled back.
+        """
+        now = time.time()
+        if not discard:
+            try:
+                entry.connection.rollback()
+            except Exception:
+                discard = True
+        with self._cond:
+            if hold and entry.checked_out_at is not None:
+                held = now - entry.checked_out_at
+                self.hold_time += held
+                self.max_hold_time = max(self.max_hold_time, held)
+                self.hold_times.append(held)
+            entry.checked_out_at = None
+            entry.last_used = now
+            if discard or entry.age(now) > self.max_lifetime:
+                self._discard(entry)
+            else:
+                self._idle.append(entry)
+                self._cond.notify()
+
+    def close(self):
+        """
+        Closes the idle connections, the checked out ones are closed when
+        they are returned.
+        """
+        with self._cond:
+            self.max_lifetime = -1
+            self._evict(time.time())
+
+    def stats(self):
+        with self._cond:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'checkouts': self.checkouts,
+                'waits': self.waits,
+                'wait_time': self.wait_time,
+                'timeouts': self.timeouts,
+                'opened': self.opened,
+                'closed': self.closed,
+                'pings': self.pings,
+                'ping_failures': self.ping_failures,
+                'hold_time': self.hold_time,
+                'max_hold_time': self.max_hold_time,
+                'hold_times': list(self.hold_times),
+            }
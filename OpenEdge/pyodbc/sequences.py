@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Block allocation of the id sequences of the OpenEdge backend.
+
+The id of a new row comes from the id_<table> sequence (see autoinc_sql). The
+values are fetched by blocks, several NEXTVAL in one statement :
+
+    SELECT TOP 100 id_table.NEXTVAL FROM SYSPROGRESS.SYSCOLUMNS
+
+and the unused values are kept by the process for the next inserts. Each value
+is still taken from the sequence by the database, so the ids stay unique for
+the threads, the processes and the 4GL programs sharing the sequence, but they
+are not ordered across processes and the values not used when a process stops
+are lost.
+
+A single value is selected from the DUAL table of the schema (DUALTABLE).
+
+The values kept for a sequence are dropped when the sequence or its table is
+dropped, created or altered, and by sql_flush and sequence_reset_sql : they
+could belong to the previous sequence.
+
+The block size is set with the SEQUENCE_BLOCK_SIZE key of the database
+settings, a count or a dict by table name ('*' for the other tables). It is 1
+by default : no value is kept, but a bulk insert of n rows still fetches its n
+values in one statement.
+
+            'SEQUENCE_BLOCK_SIZE': {'*': 1, 'order_line': 500},
+'''
+
+import collections
+import re
+import threading
+
+from django.db.utils import DatabaseError
+
+from OpenEdge.pyodbc.names import MAX_NAME_LENGTH, SEQUENCE_PREFIX
+
+# Table read for the NEXTVAL, the statement is repeated when it has less rows than asked
+ROW_SOURCE = 'SYSPROGRESS.SYSCOLUMNS'
+
+# Table or sequence of a DDL statement
+_ddl_object = re.compile(r'\b(?:TABLE|SEQUENCE)\s+(?:"?\w+"?\s*\.\s*)?"?(\w+)"?', re.I)
+
+# Allocators of the process, by (alias, sequence)
+_allocators = {}
+_allocators_lock = threading.Lock()
+
+
+def get_allocator(alias, sequence, dual='DUAL'):
+    """
+    Returns the allocator of a sequence, it is created on the first call.
+    dual is the qualified DUAL table of the database.
+    """
+    key = (alias, sequence)
+    with _allocators_lock:
+        allocator = _allocators.get(key)
+        if allocator is None:
+            allocator = _allocators[key] = SequenceAllocator(sequence, dual)
+    return allocator
+
+
+def invalidate_allocators(alias, sql=None, names=None):
+    """
+    Drops the values kept for the sequences of a database alias : the
+    sequence or the table named by a DDL statement, the sequences or tables
+    names, or all of them when both are None.
+    """
+    if sql is not None:
+        m = _ddl_object.search(sql)
+        if m is None:
+            return
+        names = [m.group(1)]
+    if names is not None:
+        # A table name stands for its id sequence
+        wanted = set()
+        for name in names:
+            wanted.add(name.lower())
+            wanted.add((SEQUENCE_PREFIX + name[:MAX_NAME_LENGTH - len(SEQUENCE_PREFIX)]).lower())
+    with _allocators_lock:
+        dropped = [key for key in _allocators
+                   if key[0] == alias and (names is None or key[1].lower() in wanted)]
+        allocators = [_allocators.pop(key) for key in dropped]
+    # The allocators may still be used by the threads which got them
+    for allocator in allocators:
+        allocator.discard()
+
+
+def block_size(settings_dict, table):
+    """
+    Returns the SEQUENCE_BLOCK_SIZE of a table.
+    """
+    size = settings_dict.get('SEQUENCE_BLOCK_SIZE', 1)
+    if isinstance(size, dict):
+        size = size.get(table, size.get('*', 1))
+    return max(int(size), 1)
+
+
+class SequenceAllocator(object):
+    """
+    Values of a sequence fetched in advance by the process.
+    """
+    def __init__(self, sequence, dual='DUAL'):
+        self.sequence = sequence
+        self.dual = dual
+        self._lock = threading.Lock()
+        self._values = collections.deque()
+        self.fetched = 0
+        self.statements = 0
+
+    def _fetch(self, count, cursor):
+        """
+        Fetches count values of the sequence, TOP returns less rows than asked
+        when the row source is too small, the statement is repeated.
+        """
+        values = []
+        while len(values) < count:
+            missing = count - len(values)
+            if missing == 1:
+                cursor.execute('select %s.nextval from %s' % (self.sequence, self.dual))
+            else:
+                cursor.execute('SELECT TOP %d %s.NEXTVAL FROM %s' % (missing, self.sequence, ROW_SOURCE))
+            rows = cursor.fetchall()
+            self.statements += 1
+            if not rows:
+                raise DatabaseError('No value returned by the sequence %s' % self.sequence)
+            values.extend([row[0] for row in rows])
+        self.fetched += len(values)
+        return values
+
+    def allocate(self, count, cursor, block=1):
+        """
+        Returns count values of the sequence. When the values kept are not
+        enough, the missing ones (at least a block) are fetched in one statement.
+        """
+        with self._lock:
+            if len(self._values) < count:
+                missing = max(count - len(self._values), block)
+                self._values.extend(self._fetch(missing, cursor))
+            return [self._values.popleft() for i in xrange(count)]
+
+    def discard(self):
+        """
+        Drops the values kept.
+        """
+        with self._lock:
+            self._values.clear()
+
+    def next_value(self, cursor, block=1):
+        return self.allocate(1, cursor, block)[0]
+
+    def stats(self):
+        with self._lock:
+            return {'kept': len(self._values), 'fetched': self.fetched, 'statements': self.statements}
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Session state of the OpenEdge backend.
+
+The connection settings are parsed once from the settings_dict (SessionConfig),
+and the bootstrap of a physical connection (SET SCHEMA and the check of the
+DUAL table) is remembered per connection (SessionState), so the following
+cursors reuse it instead of running it again.
+'''
+
+from django.core.exceptions import ImproperlyConfigured
+
+#===============================================================================
+# settings_dict keys used to build the session, a change of one of them
+# (ie: the USER swapped by the test database creation) rebuilds the config.
+#===============================================================================
+SESSION_KEYS = ('CPINTERNAL', 'TYPECNX', 'DUALTABLE', 'DEFAULTSCHEMA',
+                'NAME', 'HOST', 'USER', 'PASSWORD', 'PORT',
+                'DATABASE_NAME', 'DATABASE_HOST', 'DATABASE_USER',
+                'DATABASE_PASSWORD', 'DATABASE_PORT')
+
+
+def session_signature(settings_dict):
+    """
+    Returns the values of the settings_dict used to build a SessionConfig.
+    """
+    return tuple([settings_dict.get(key) for key in SESSION_KEYS])
+
+
+class SessionConfig(object):
+    """
+    Connection settings of a DatabaseWrapper, parsed once from its settings_dict.
+    """
+    def __init__(self, settings_dict, django_version):
+        #=======================================================================
+        # DSN=eslemien;HOST=localhost;DB=eslemien;UID=jyp;PWD=jyp;PORT=50000
+        #=======================================================================
+        self.signature = session_signature(settings_dict)
+
+        # Get OpenEdge internal Db Codepage (default iso8859-1)
+        self.cpinternal = settings_dict.get('CPINTERNAL', 'iso8859-1')
+
+        typecnx = settings_dict.get('TYPECNX') or {}
+        if typecnx.has_key('DSN'):
+            typecnx_str = 'DSN=%s' % typecnx['DSN']
+        elif typecnx.has_key('DRIVER'):
+            typecnx_str = 'DRIVER={%s}' % typecnx['DRIVER']
+        else:
+            raise ImproperlyConfigured('You need to specify TYPECNX (DSN or DRIVER) in your Django settings file.')
+
+        self.dual = settings_dict.get('DUALTABLE', 'DUAL')
+
+        if settings_dict.get('DEFAULTSCHEMA'):
+            self.defschema = settings_dict['DEFAULTSCHEMA']
+        else:
+            self.defschema = settings_dict['USER']
+
+        if django_version >= 12:
+            prefix = ''
+        else:
+            prefix = 'DATABASE_'
+
+        self.db_name = settings_dict[prefix + 'NAME'] or None
+        host_str = settings_dict[prefix + 'HOST'] or 'localhost'
+        user_str = settings_dict[prefix + 'USER'] or None
+        passwd_str = settings_dict[prefix + 'PASSWORD'] or ''
+        port_str = settings_dict[prefix + 'PORT'] or None
+
+        self.connstr = '%s;HOST=%s;DB=%s;UID=%s;PWD=%s;PORT=%s' % (typecnx_str, host_str, self.db_name,
+                                                                user_str, passwd_str, port_str)
+
+
+class SessionState(object):
+    """
+    Bootstrap state of one physical connection : the schema set with SET SCHEMA
+    and the DUAL table known to exist in this schema.
+    """
+    # SET SCHEMA, its COMMIT and the SYSPROGRESS.SYSTABLES lookup of the DUAL table
+    BOOTSTRAP_ROUND_TRIPS = 3
+
+    def __init__(self):
+        self.schema = None
+        self.dual = None
+
+    def is_ready(self, config):
+        """
+        Returns True if the connection is already bootstrapped for this config.
+        """
+        return self.schema == config.defschema and self.dual == config.dual
+
+    def set_ready(self, config):
+        self.schema = config.defschema
+        self.dual = config.dual
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Slow query log of the OpenEdge backend.
+
+With the SLOW_QUERY_LOG key of the database settings, the statements (execute,
+executemany or fetch) longer than THRESHOLD seconds are written as JSON lines
+in a rotating local file, with their fingerprint, a sample of their parameters
+and the location of the code that ran them :
+
+    DATABASES = {
+        'default': {
+            'ENGINE': 'OpenEdge.pyodbc',
+            ...
+            'SLOW_QUERY_LOG': {
+                'THRESHOLD': 0.5,
+                'PATH': '/var/log/django/openedge-slow.log',
+            },
+        }
+    }
+
+The other keys are MAX_BYTES and BACKUP_COUNT (rotation of the file) and
+SAMPLES (parameter sets kept by fingerprint, see SlowQueryLog.stats()).
+
+The top offenders by total time are printed by the oe_slowqueries command
+('OpenEdge' must be in INSTALLED_APPS) :
+
+    python manage.py oe_slowqueries --database default --limit 10
+'''
+
+import collections
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+
+import django
+
+import OpenEdge
+from OpenEdge.pyodbc.instrumentation import Instrument
+
+SLOW_QUERY_LOG_DEFAULTS = {
+    'THRESHOLD': 1.0,
+    'PATH': 'openedge-slow.log',
+    'MAX_BYTES': 10 * 1024 * 1024,
+    'BACKUP_COUNT': 5,
+    'SAMPLES': 3,
+}
+
+# Longest parameter value written in the log
+MAX_PARAM_LENGTH = 200
+
+# The caller is the first frame outside of these directories
+_internal_dirs = (os.path.dirname(django.__file__) + os.sep,
+                  os.path.dirname(OpenEdge.__file__) + os.sep)
+
+
+def slow_query_log_options(settings_dict):
+    """
+    Returns the SLOW_QUERY_LOG options of a database completed with the
+    defaults, or None if the slow query log is disabled.
+    """
+    options = settings_dict.get('SLOW_QUERY_LOG')
+    if not options:
+        return None
+    if options is True:
+        options = {}
+    return dict(SLOW_QUERY_LOG_DEFAULTS, **options)
+
+
+def caller_location():
+    """
+    Returns 'file:line in function' of the code running the statement.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if not filename.startswith(_internal_dirs):
+            return '%s:%d in %s' % (filename, frame.f_lineno, frame.f_code.co_name)
+        frame = frame.f_back
+    return None
+
+
+def sample_params(params):
+    """
+    Returns the parameters as JSON values, the long values are truncated.
+    """
+    sample = []
+    for value in params or ():
+        if isinstance(value, str):
+            value = value.decode('utf-8', 'replace')
+        elif not isinstance(value, (unicode, int, long, float, bool, type(None))):
+            value = unicode(value)
+        if isinstance(value, unicode) and len(value) > MAX_PARAM_LENGTH:
+            value = value[:MAX_PARAM_LENGTH] + u'...'
+        sample.append(value)
+    return sample
+
+
+class SlowQueryLog(Instrument):
+    """
+    Writes the slow statements in the log file and keeps their statistics
+    by fingerprint.
+    """
+    def __init__(self, alias, settings_dict):
+        super(SlowQueryLog, self).__init__(alias, settings_dict)
+        options = slow_query_log_options(settings_dict) or dict(SLOW_QUERY_LOG_DEFAULTS)
+        self.threshold = options['THRESHOLD']
+        self.path = options['PATH']
+        self.samples = options['SAMPLES']
+        self._lock = threading.Lock()
+        self._stats = {}
+
+        self.logger = logging.getLogger('OpenEdge.slowlog.%s' % alias)
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        if not self.logger.handlers:
+            handler = logging.handlers.RotatingFileHandler(
+                self.path, maxBytes=options['MAX_BYTES'], backupCount=options['BACKUP_COUNT'])
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self.logger.addHandler(handler)
+
+    def record(self, sql, operation, params, rows, driver_time, transform_time, transcoded, error=False):
+        elapsed = driver_time + transform_time
+        if elapsed < self.threshold:
+            return
+
+        if operation == 'executemany':
+            # First parameter set only
+            params = params and params[0] or ()
+        fp = self.fingerprint(sql)
+        params = sample_params(params)
+        caller = caller_location()
+
+        with self._lock:
+            entry = self._stats.get(fp)
+            if entry is None:
+                entry = self._stats[fp] = {
+                    'count': 0,
+                    'errors': 0,
+                    'total_time': 0.0,
+                    'max_time': 0.0,
+                    'samples': collections.deque(maxlen=self.samples),
+                    'callers': collections.Counter(),
+                }
+            entry['count'] += 1
+            if error:
+                entry['errors'] += 1
+            entry['total_time'] += elapsed
+            entry['max_time'] = max(entry['max_time'], elapsed)
+            if params:
+                entry['samples'].append(params)
+            entry['callers'][caller] += 1
+
+        if isinstance(sql, str):
+            sql = sql.decode('utf-8', 'replace')
+        self.logger.info(json.dumps({
+            'time': datetime.datetime.now().isoformat(),
+            'alias': self.alias,
+            'operation': operation,
+            'fingerprint': fp,
+            'sql': sql,
+            'params': params,
+            'elapsed': elapsed,
+            'driver_time': driver_time,
+            'transform_time': transform_time,
+            'rows': rows,
+            'error': error,
+            'caller': caller,
+        }))
+
+    def stats(self):
+        """
+        Returns the statistics of the slow statements of this process, by
+        fingerprint, with their last parameter sets and their callers.
+        """
+        with self._lock:
+            return dict([(fp, dict(entry, samples=list(entry['samples']),
+                                   callers=dict(entry['callers'])))
+                         for fp, entry in self._stats.iteritems()])
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+def read_log(path):
+    """
+    Yields the entries of a slow query log and its backups, oldest first.
+    The lines that are not valid JSON are skipped.
+    """
+    paths = []
+    index = 1
+    while os.path.exists('%s.%d' % (path, index)):
+        paths.insert(0, '%s.%d' % (path, index))
+        index += 1
+    if os.path.exists(path):
+        paths.append(path)
+
+    for p in paths:
+        with open(p) as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def summarize(entries):
+    """
+    Returns the statistics of log entries by fingerprint, sorted by total time.
+    """
+    summary = {}
+    for entry in entries:
+        fp = entry.get('fingerprint')
+        st = summary.get(fp)
+        if st is None:
+            st = summary[fp] = {
+                'fingerprint': fp,
+                'count': 0,
+                'total_time': 0.0,
+                'max_time': 0.0,
+                'sample': None,
+                'callers': collections.Counter(),
+            }
+        st['count'] += 1
+        st['total_time'] += entry.get('elapsed', 0.0)
+        st['max_time'] = max(st['max_time'], entry.get('elapsed', 0.0))
+        if entry.get('params'):
+            st['sample'] = entry['params']
+        st['callers'][entry.get('caller')] += 1
+    return sorted(summary.values(), key=lambda st: st['total_time'], reverse=True)
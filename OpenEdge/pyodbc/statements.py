@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Statement classification for the OpenEdge backend.
+
+The kind of a statement is found from its leading keywords in one match, so the
+DML statements never go through the DDL rewriting of CursorWrapper.
+'''
+
+import re
+
+SELECT = 'SELECT'
+INSERT = 'INSERT'
+UPDATE = 'UPDATE'
+DELETE = 'DELETE'
+CREATE_TABLE = 'CREATE TABLE'
+ALTER_TABLE = 'ALTER TABLE'
+# The other CREATE, ALTER, DROP... statements
+DDL = 'DDL'
+OTHER = 'OTHER'
+
+DML_KINDS = (SELECT, INSERT, UPDATE, DELETE)
+DDL_KINDS = (CREATE_TABLE, ALTER_TABLE, DDL)
+
+DDL_KEYWORDS = ('CREATE', 'ALTER', 'DROP', 'RENAME', 'GRANT', 'REVOKE', 'TRUNCATE')
+
+_leading = re.compile(r'\s*\(?\s*(\w+)(?:\s+(\w+))?')
+
+
+def classify_sql(sql):
+    """
+    Returns the kind of a statement from its leading keywords.
+    """
+    m = _leading.match(sql)
+    if m is None:
+        return OTHER
+    first = m.group(1).upper()
+    if first in DML_KINDS:
+        return first
+    if first in DDL_KEYWORDS:
+        second = (m.group(2) or '').upper()
+        if second == 'TABLE':
+            if first == 'CREATE':
+                return CREATE_TABLE
+            if first == 'ALTER':
+                return ALTER_TABLE
+        return DDL
+    return OTHER
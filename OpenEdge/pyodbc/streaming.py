@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Streaming reads of the OpenEdge backend.
+
+With the CHUNKED_READS key of the database settings, the result sets of the
+querysets are read with fetchmany() by blocks of CHUNK_SIZE rows, instead of
+being loaded in memory before the first row is returned :
+
+    DATABASES = {
+        'default': {
+            'ENGINE': 'OpenEdge.pyodbc',
+            ...
+            'CHUNKED_READS': True,
+            'CHUNK_SIZE': 1000,
+        }
+    }
+
+The querysets read with stream() run on a dedicated connection (see
+DatabaseWrapper.chunked_cursor), so the other queries and their commits can
+run while the result set is read; the other querysets are read by blocks on
+the connection of the thread :
+
+    for item in stream(Item.objects.all()):
+        ...
+
+With the PREFETCH key, the streaming reads on a dedicated connection fetch the
+next blocks on a worker thread while the current block is processed, PREFETCH
+is the count of blocks read ahead :
+
+            'PREFETCH': 2,
+
+The streaming writes take the rows from any iterable (ie: a generator) and send
+them by slices of WRITE_CHUNK_SIZE rows (1000 by default), only one slice is
+held in memory :
+
+    cursor = connection.cursor()
+    cursor.executemany_iter('INSERT INTO "item" ("name", "qty") VALUES (%s, %s)',
+                            read_rows(), progress=report)
+
+    bulk_create_iter(Item, (Item(name=n) for n in names), progress=report)
+'''
+
+import itertools
+import Queue
+import sys
+import threading
+
+
+def chunk_iter(cursor, chunk_size, sentinel, trim=0):
+    """
+    Yields the blocks of rows of a cursor. The trim last columns of the rows
+    (ordering aliases) are removed. The cursor is closed when the result set
+    is exhausted or when the iteration is stopped.
+    """
+    try:
+        for rows in iter((lambda: cursor.fetchmany(chunk_size)), sentinel):
+            if trim:
+                yield [r[:-trim] for r in rows]
+            else:
+                yield rows
+    finally:
+        cursor.close()
+
+
+def stream(queryset):
+    """
+    Returns an iterator on the rows of a queryset, read on a dedicated
+    connection with CHUNKED_READS.
+    """
+    queryset = queryset._clone()
+    queryset.query.stream = True
+    return queryset.iterator()
+
+
+# End of the result set, in the queue of a ReadAhead
+_END = object()
+
+
+class _Failure(object):
+    """
+    Exception raised by the worker of a ReadAhead, raised again by the consumer.
+    """
+    def __init__(self, exc_info):
+        self.exc_info = exc_info
+
+
+class ReadAhead(object):
+    """
+    Iterator on the blocks of rows of a cursor, the next blocks are fetched by
+    a worker thread while the current one is processed. At most depth blocks
+    are waiting in the queue. The worker is stopped and the cursor closed when
+    the iteration ends or is stopped.
+    """
+    # Seconds between two checks of the cancellation by a blocked worker
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, cursor, chunk_size, sentinel, trim=0, depth=2):
+        self.queue = Queue.Queue(max(depth, 1))
+        self.stopped = threading.Event()
+        self.chunks = chunk_iter(cursor, chunk_size, sentinel, trim)
+        self.thread = threading.Thread(target=self._fetch, name='OpenEdge read-ahead')
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _put(self, item):
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=self.POLL_INTERVAL)
+                return True
+            except Queue.Full:
+                pass
+        return False
+
+    def _fetch(self):
+        try:
+            try:
+                for rows in self.chunks:
+                    if not self._put(rows):
+                        break
+            finally:
+                # Closes the cursor in the worker thread
+                self.chunks.close()
+        except Exception:
+            self._put(_Failure(sys.exc_info()))
+        self._put(_END)
+
+    def __iter__(self):
+        try:
+            while True:
+                item = self.queue.get()
+                if item is _END:
+                    return
+                if isinstance(item, _Failure):
+                    exc_info = item.exc_info
+                    raise exc_info[0], exc_info[1], exc_info[2]
+                yield item
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Stops the worker, it is waited until it has closed the cursor.
+        """
+        self.stopped.set()
+        while True:
+            try:
+                self.queue.get_nowait()
+            except Queue.Empty:
+                break
+        if self.thread is not threading.current_thread():
+            self.thread.join()
+
+
+def slices(iterable, size):
+    """
+    Yields the rows of an iterable by lists of size rows.
+    """
+    iterator = iter(iterable)
+    while True:
+        rows = list(itertools.islice(iterator, size))
+        if not rows:
+            return
+        yield rows
+
+
+def bulk_create_iter(model, objs, batch_size=None, progress=None, using=None):
+    """
+    Inserts the model instances of an iterable with bulk_create, by slices of
+    batch_size instances. progress(count) is called with the count of
+    instances inserted after each slice. Returns the count of instances.
+    """
+    from django.db import connections, router
+    using = using or router.db_for_write(model)
+    batch_size = batch_size or connections[using].settings_dict.get('WRITE_CHUNK_SIZE', 1000)
+    count = 0
+    for objs in slices(objs, batch_size):
+        model._default_manager.db_manager(using).bulk_create(objs)
+        count += len(objs)
+        if progress is not None:
+            progress(count)
+    return count
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Round trips of a loop of 1000 Item.save(force_update=True), an UPDATE each, on
+the pyodbc stand-in, which counts the statements and the commits sent to the
+driver (see stand_in/pyodbc.py).
+The loop runs outside of a transaction and in commit_on_success, with the
+default COMMIT_MODE and with COMMIT_MODE='statement', the commit after every
+statement of the previous versions.
+'''
+
+import bench_setup
+
+from django.db import connections, transaction
+
+from benchapp.models import Item
+
+SAVES = 1000
+
+
+def save_loop():
+    for i in xrange(SAVES):
+        Item(pk=i, name=u'item %d' % i, qty=i).save(force_update=True)
+
+
+def round_trips(mode, managed):
+    db = connections['default']
+    db.commit_mode = mode
+    # The first save reads the catalog
+    Item(pk=0, name=u'item', qty=0).save(force_update=True)
+    raw = db.connection
+    statements, commits = raw.statements, raw.commits
+    if managed:
+        transaction.commit_on_success()(save_loop)()
+    else:
+        save_loop()
+    return raw.statements - statements, raw.commits - commits
+
+
+if __name__ == '__main__':
+    for managed in (False, True):
+        for mode in ('statement', 'transaction'):
+            statements, commits = round_trips(mode, managed)
+            print '%-17s %-11s %5d statements %5d commits %5d round trips' % (
+                managed and 'commit_on_success' or 'not managed', mode,
+                statements, commits, statements + commits)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Compile time of SQLCompiler.as_sql on the pyodbc stand-in, with and without the
+compiled SQL cache (COMPILED_CACHE_SIZE). The values of the filters change on each query, as in
+an application, and the best of REPEAT runs is kept. The querysets are built
+before the timing :
+
+    python benchmarks/bench_compile.py
+'''
+
+import bench_setup
+
+import itertools
+import time
+
+from django.db import connections
+
+from OpenEdge.pyodbc.cache import LRUCache
+
+from benchapp.models import Item
+
+NUMBER = 5000
+REPEAT = 3
+
+values = itertools.count()
+
+
+def build():
+    value = next(values)
+    qs = Item.objects.filter(qty__gt=value, name__startswith=u'a%d' % value).exclude(qty=value + 2).order_by('-qty')[:20]
+    return qs.query.get_compiler('default')
+
+
+def compile_time(cache_size):
+    db = connections['default']
+    db.cursor()
+    db.compiled_cache = LRUCache(cache_size)
+    runs = []
+    for run in xrange(REPEAT):
+        compilers = [build() for i in xrange(NUMBER)]
+        started = time.time()
+        for compiler in compilers:
+            compiler.as_sql()
+        runs.append(time.time() - started)
+    return min(runs) / NUMBER * 1e6, db.compiled_cache.stats()
+
+
+if __name__ == '__main__':
+    print build().as_sql()[0]
+    for size in (0, 500):
+        us, stats = compile_time(size)
+        print 'as_sql, COMPILED_CACHE_SIZE %3d  %6.1f us/query  %r' % (size, us, stats)
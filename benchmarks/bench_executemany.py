@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Bulk insert through CursorWrapper.executemany on the pyodbc stand-in, whose
+executemany waits a round trip per row, or per array of 1000 rows with
+fast_executemany (see stand_in/pyodbc.py). The parameters are encoded by the
+backend as for the server. The modes :
+
+    python benchmarks/bench_executemany.py            # plain executemany
+    python benchmarks/bench_executemany.py fast       # FAST_EXECUTEMANY
+    python benchmarks/bench_executemany.py fallback   # FAST_EXECUTEMANY rejected by the driver
+'''
+
+import bench_setup
+
+import datetime
+import decimal
+import sys
+import time
+
+import pyodbc
+
+from django.db import connections
+
+ROWS = 20000
+BATCH = 5000
+SQL = 'INSERT INTO "t" ("a", "b", "c", "d") VALUES (%s, %s, %s, %s)'
+
+
+if __name__ == '__main__':
+    mode = sys.argv[1:] and sys.argv[1] or 'plain'
+    pyodbc.ROUND_TRIP = 0.0002
+    pyodbc.REJECT_INPUT_SIZES = mode == 'fallback'
+    db = connections['default']
+    db.fast_executemany = mode != 'plain'
+
+    rows = [(i, u'caf\xe9 %d' % i, decimal.Decimal('12.50'), datetime.date(2020, 1, 1)) for i in xrange(ROWS)]
+    cursor = db.cursor()
+    started = time.time()
+    for start in xrange(0, ROWS, BATCH):
+        cursor.executemany(SQL, rows[start:start + BATCH])
+    print '%-8s %.2fs for %d rows, fast_executemany %s' % (mode, time.time() - started, ROWS, db.fast_executemany)
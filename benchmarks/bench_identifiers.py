@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Throughput of the identifier truncation of the compiler : the former
+formatTableName (split on the quotes) against truncate_identifiers, with and
+without its memo of the fragments. The results of both are printed for the
+corpus, the former one truncates the literals :
+
+    python benchmarks/bench_identifiers.py
+'''
+
+import bench_setup
+
+import re
+import timeit
+
+from OpenEdge.pyodbc import identifiers
+from OpenEdge.pyodbc.identifiers import truncate_identifiers
+
+MAX_NAME_LENGTH = 32
+NUMBER = 20000
+
+CORPUS = [
+    '"benchapp_item"."id"',
+    '"benchapp_item"',
+    'SELECT "a_very_long_table_name_for_a_customer_test"."id"',
+    '("benchapp_item"."name" LIKE %s ESCAPE \'\\\'   AND "benchapp_item"."qty" > %s  '
+    'AND NOT ("benchapp_item"."qty" = %s ))',
+    '"benchapp_item"."qty" IN (%s, %s, %s)',
+    '"t"."name" COLLATE Latin1_General_CI_AS LIKE %s',
+    'INNER JOIN "a_very_long_table_name_for_a_customer_test" ON '
+    '("x"."cust_id" = "a_very_long_table_name_for_a_customer_test"."id")',
+    '"t"."name" = \'a "quoted_and_long_literal_of_more_than_32_characters" value\'',
+    '"t"."id" > %s AND "t"."qty" BETWEEN %s AND %s AND "t"."flag" = %s AND "t"."name" IS NOT NULL',
+]
+
+
+def former_format(data):
+    """
+    formatTableName before truncate_identifiers.
+    """
+    tdata = data.split('"')
+    for i, v in enumerate(tdata):
+        if 'IN (' in v or ' LIKE ' in v:
+            if 'COLLATE' in v:
+                tdata[i] = re.sub('COLLATE (\w+) ', '', v)
+            else:
+                tdata[i] = v
+        else:
+            tdata[i] = v[:MAX_NAME_LENGTH]
+    return '"'.join(tdata)
+
+
+def run_former():
+    for fragment in CORPUS:
+        former_format(fragment)
+
+
+def run_new():
+    for fragment in CORPUS:
+        truncate_identifiers(fragment, MAX_NAME_LENGTH)
+
+
+def run_new_no_memo():
+    identifiers._fragments.clear()
+    run_new()
+
+
+if __name__ == '__main__':
+    for fragment in CORPUS:
+        former, new = former_format(fragment), truncate_identifiers(fragment, MAX_NAME_LENGTH)
+        print former == new and 'same' or 'DIFF', '\n  former: %s\n  new:    %s' % (former, new)
+    for name, func in (('former formatTableName', run_former), ('truncate_identifiers', run_new),
+                       ('without fragment memo', run_new_no_memo)):
+        seconds = timeit.timeit(func, number=NUMBER)
+        print '%-24s %6.2f us/fragment' % (name, seconds / NUMBER / len(CORPUS) * 1e6)
@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+'''
+Imported first by the benchmarks : the pyodbc stand-in and the backend of this
+tree are found before the installed ones.
+'''
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(HERE, 'stand_in'), HERE, os.path.dirname(HERE)]
+os.environ['DJANGO_SETTINGS_MODULE'] = 'benchsettings'
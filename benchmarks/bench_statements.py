@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Per-statement overhead of CursorWrapper.execute on the pyodbc stand-in.
+
+The DDL detection of the former execute (two uncompiled re.search on every
+statement) is compared with classify_sql, then the whole execute of a DML
+statement is timed, with and without the statement cache :
+
+    python benchmarks/bench_statements.py
+'''
+
+import bench_setup
+
+import re
+import timeit
+
+from django.db import connections
+
+from OpenEdge.pyodbc.cache import LRUCache
+from OpenEdge.pyodbc.statements import classify_sql
+
+STATEMENTS = [
+    'SELECT "benchapp_item"."id", "benchapp_item"."name", "benchapp_item"."qty" FROM "benchapp_item" '
+    'WHERE "benchapp_item"."id" = %s ',
+    'INSERT INTO "benchapp_item" ("name", "qty", "id") VALUES (%s, %s, %s)',
+    'UPDATE "benchapp_item" SET "qty" = %s WHERE "benchapp_item"."id" = %s ',
+    'DELETE FROM "benchapp_item" WHERE "id" IN (%s, %s)',
+]
+NUMBER = 20000
+
+
+def former_detection(sql):
+    sql = sql.replace('\n', '')
+    return re.search('CREATE TABLE ', sql) is not None or re.search('ALTER TABLE ', sql) is not None
+
+
+def per_statement(func):
+    seconds = timeit.timeit(lambda: [func(sql) for sql in STATEMENTS], number=NUMBER)
+    return seconds / NUMBER / len(STATEMENTS) * 1e6
+
+
+def execute_overhead(cache_size):
+    db = connections['default']
+    db.statement_cache = LRUCache(cache_size)
+    cursor = db.cursor().cursor
+    sql = STATEMENTS[0]
+    seconds = timeit.timeit(lambda: cursor.execute(sql, (1,)), number=NUMBER)
+    return seconds / NUMBER * 1e6
+
+
+if __name__ == '__main__':
+    print 'DDL detection, former execute  %6.2f us/statement' % per_statement(former_detection)
+    print 'DDL detection, classify_sql    %6.2f us/statement' % per_statement(classify_sql)
+    for size in (0, 500):
+        print 'execute, STATEMENT_CACHE_SIZE %3d  %6.2f us/statement' % (size, execute_overhead(size))
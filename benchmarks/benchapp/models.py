@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+from django.db import models
+
+
+class Item(models.Model):
+    name = models.CharField(max_length=30)
+    qty = models.IntegerField(default=0)
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+'''
+Django settings of the benchmarks, on the pyodbc stand-in.
+'''
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'OpenEdge.pyodbc',
+        'NAME': 'bench',
+        'USER': 'bench',
+        'PASSWORD': 'bench',
+        'HOST': 'localhost',
+        'PORT': '5000',
+        'DEFAULTSCHEMA': 'pub',
+        'TYPECNX': {'DSN': 'bench'},
+    }
+}
+INSTALLED_APPS = ['benchapp']
+SECRET_KEY = 'bench'
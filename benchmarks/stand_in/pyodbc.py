@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Local stand-in of the pyodbc module, for the benchmarks only : no ODBC driver
+and no server, the statements are not run. executemany waits ROUND_TRIP
+seconds per row, or per array of ARRAY_ROWS rows with fast_executemany, as a
+server round trip. setinputsizes raises the error of a driver without array
+binding when REJECT_INPUT_SIZES is set. The connections count their
+statements, commits and rollbacks.
+'''
+
+import time
+
+version = '3.0.7'
+SQL_DBMS_VER = 18
+
+SQL_VARCHAR = 12
+SQL_WVARCHAR = -9
+SQL_INTEGER = 4
+SQL_BIGINT = -5
+SQL_DOUBLE = 8
+SQL_DECIMAL = 3
+SQL_TYPE_DATE = 91
+SQL_TYPE_TIME = 92
+SQL_TYPE_TIMESTAMP = 93
+
+ROUND_TRIP = 0.0
+ARRAY_ROWS = 1000
+REJECT_INPUT_SIZES = False
+
+
+class Error(Exception):
+    pass
+
+
+class DatabaseError(Error):
+    pass
+
+
+class IntegrityError(DatabaseError):
+    pass
+
+
+class Cursor(object):
+    def __init__(self, connection):
+        self.connection = connection
+        self.rows = []
+        self.description = None
+        self.rowcount = -1
+        self.fast_executemany = False
+
+    def execute(self, sql, *params):
+        self.connection.statements += 1
+        self.rows = []
+        self.description = None
+        return self
+
+    def executemany(self, sql, seq):
+        self.connection.statements += 1
+        rows = len(list(seq))
+        if self.fast_executemany:
+            time.sleep(ROUND_TRIP * (1 + rows // ARRAY_ROWS))
+        else:
+            time.sleep(ROUND_TRIP * rows)
+        self.rowcount = rows
+
+    def setinputsizes(self, sizes):
+        if REJECT_INPUT_SIZES:
+            raise Error('HYC00', 'Optional feature not implemented')
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def fetchone(self):
+        return self.rows and self.rows.pop(0) or None
+
+    def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def close(self):
+        pass
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+
+class Connection(object):
+    autocommit = False
+
+    def __init__(self, connstr):
+        self.connstr = connstr
+        self.statements = 0
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return Cursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+    def getinfo(self, key):
+        return '11.03.0000'
+
+
+def connect(connstr, **kwargs):
+    return Connection(connstr)
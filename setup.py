@@ -22,7 +22,8 @@ The South integration permits to migrate the database schema.
     author_email='monasysinfo@gmail.com',
     platforms="Independent",
     url='http://monasysinfo.github.io/pyodbcOpenEdge/',
-    packages=['OpenEdge','OpenEdge.OEmodels','OpenEdge.pyodbc','OpenEdge.south'],
+    packages=['OpenEdge','OpenEdge.OEmodels','OpenEdge.pyodbc','OpenEdge.south',
+              'OpenEdge.management','OpenEdge.management.commands'],
     license="BSD",
     classifiers=[
         'Development Status :: 4 - Beta',
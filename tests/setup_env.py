@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Imported first by the tests, which run from the root of the tree :
+
+    python -m unittest discover -s tests
+
+By default the backend runs on the pyodbc stand-in of the benchmarks (see
+benchmarks/stand_in), without ODBC driver nor server. The tests needing an
+OpenEdge server run when OPENEDGE_TEST_CONNSTR is set to a pyodbc connection
+string, the others are then skipped.
+'''
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+CONNSTR = os.environ.get('OPENEDGE_TEST_CONNSTR')
+ON_SERVER = bool(CONNSTR)
+
+paths = [HERE, os.path.join(ROOT, 'benchmarks'), ROOT]
+if not ON_SERVER:
+    paths.insert(0, os.path.join(ROOT, 'benchmarks', 'stand_in'))
+sys.path[:0] = paths
+os.environ['DJANGO_SETTINGS_MODULE'] = 'benchsettings'
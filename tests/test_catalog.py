@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Catalog cache of a schema.
+'''
+
+import setup_env
+
+import unittest
+
+# The backend is loaded by django.db before its modules
+import django.db
+
+from OpenEdge.pyodbc.catalog import Catalog
+
+
+class CatalogCursor(object):
+    """
+    Cursor answering the catalog queries with the rows of the table given.
+    """
+    def __init__(self, columns=(), indexes=()):
+        self.answers = {'SYSCOLUMNS': list(columns), 'SYSINDEXES': list(indexes)}
+        self.rows = []
+
+    def execute(self, sql, *params):
+        self.rows = [row for source, rows in self.answers.items() if source in sql for row in rows]
+        return self
+
+    def fetchall(self):
+        return self.rows
+
+
+class CatalogTest(unittest.TestCase):
+
+    def test_table_case(self):
+        catalog = Catalog('pub')
+        cursor = CatalogCursor([('Customer', 'id'), ('Customer', 'name')],
+                               [('Customer', 'ix_name', 'D', 'name')])
+        catalog.warmup(cursor)
+        self.assertEqual(catalog.cached_columns('customer'), ['id', 'name'])
+        self.assertEqual(catalog.columns('CUSTOMER', None), ['id', 'name'])
+        self.assertEqual(catalog.indexes('customer', None), {'ix_name': {'unique': False, 'columns': ['name']}})
+        catalog.invalidate('CUSTOMER')
+        self.assertEqual(catalog.cached_columns('Customer'), None)
+
+    def test_table_query_case(self):
+        catalog = Catalog('pub')
+        cursor = CatalogCursor(indexes=[('Customer', 'ix_name', 'U', 'name')])
+        self.assertEqual(catalog.indexes('customer', cursor), {'ix_name': {'unique': True, 'columns': ['name']}})
+        self.assertEqual(catalog.queries, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+The SQL taken from the compiled cache is the SQL compiled without it.
+'''
+
+from setup_env import ON_SERVER
+
+import datetime
+import unittest
+
+from django.db import connection
+from django.db.models import F, Q
+
+from OpenEdge.pyodbc.cache import LRUCache
+
+from benchapp.models import Item
+
+
+def querysets(n):
+    """
+    Querysets of the same structure for each n, with other values.
+    """
+    return [
+        Item.objects.filter(qty__gt=n, name__startswith=u'a%d' % n).exclude(qty=n + 2),
+        Item.objects.filter(Q(qty=n) | Q(name__icontains=u'%d' % n), ~Q(name=u'x%d' % n)),
+        Item.objects.filter(qty__in=range(n % 3 + 1)),
+        Item.objects.filter(qty__in=[]),
+        Item.objects.filter(name__isnull=n % 2 == 0, qty__range=(n, n + 5)),
+        Item.objects.filter(name=u'' if n % 2 else u'n'),
+        Item.objects.extra(where=['"qty" > %s'], params=[n]).filter(qty__lt=n * 2),
+        Item.objects.filter(qty=F('id') + n),
+        Item.objects.filter(pk__in=Item.objects.filter(qty=n).values('pk')),
+        Item.objects.filter(name__gte=datetime.date(2020, 1, n % 28 + 1)).order_by('-name')[n:n + 10],
+    ]
+
+
+@unittest.skipIf(ON_SERVER, 'runs on the pyodbc stand-in')
+class CompiledCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        connection.cursor()
+        self.saved = connection.compiled_cache
+
+    def tearDown(self):
+        connection.compiled_cache = self.saved
+
+    def compile_all(self, n):
+        result = []
+        for queryset in querysets(n):
+            try:
+                result.append(queryset.query.get_compiler(connection=connection).as_sql())
+            except Exception, e:
+                result.append(type(e))
+        return result
+
+    def test_same_sql_and_params(self):
+        cache = connection.compiled_cache = LRUCache(500)
+        for n in xrange(6):
+            cached = self.compile_all(n)
+            connection.compiled_cache = LRUCache(0)
+            self.assertEqual(cached, self.compile_all(n))
+            connection.compiled_cache = cache
+        self.assertTrue(cache.stats()['hits'] > 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
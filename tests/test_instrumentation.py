@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Measures sent to the instruments by the cursors.
+'''
+
+from setup_env import ON_SERVER
+
+import time
+import unittest
+
+import pyodbc
+
+from django.db import connection
+
+from OpenEdge.pyodbc.instrumentation import StatementStats
+
+SELECT = 'SELECT "name" FROM "benchapp_item"'
+# Time spent by the wrapper after the statement
+WRAPPER_TIME = 0.05
+
+
+def fail(sql, *params):
+    raise pyodbc.Error('42S02', 'Table not found')
+
+
+@unittest.skipIf(ON_SERVER, 'runs on the pyodbc stand-in')
+class RecordTest(unittest.TestCase):
+
+    def setUp(self):
+        self.stats = StatementStats('default', {})
+        self.cursor = connection.cursor().cursor
+        self.cursor.instrument = self.stats
+
+    def entry(self):
+        return self.stats.stats()[self.stats.fingerprint(SELECT)]
+
+    def test_driver_time_of_the_statement_only(self):
+        end_statement = self.cursor._end_statement
+        self.cursor._end_statement = lambda kind: (time.sleep(WRAPPER_TIME), end_statement(kind))
+        self.cursor.execute(SELECT)
+        entry = self.entry()
+        self.assertEqual((entry['count'], entry['errors']), (1, 0))
+        self.assertTrue(entry['driver_time'] < WRAPPER_TIME)
+
+    def test_failed_statement(self):
+        self.cursor.cursor.execute = fail
+        self.assertRaises(pyodbc.DatabaseError, self.cursor.execute, SELECT)
+        entry = self.entry()
+        self.assertEqual((entry['count'], entry['errors']), (1, 1))
+
+    def test_failed_executemany(self):
+        self.cursor.cursor.executemany = fail
+        self.assertRaises(pyodbc.Error, self.cursor.executemany, SELECT, [(1,), (2,)])
+        entry = self.entry()
+        self.assertEqual((entry['count'], entry['executemany'], entry['errors']), (1, 1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Use of the model names by the operations.
+'''
+
+from setup_env import ON_SERVER
+
+import unittest
+
+from django.core.management.color import no_style
+from django.db import connection
+from django.db.utils import DatabaseError
+
+from OpenEdge.pyodbc.names import model_names, table_names
+from OpenEdge.pyodbc.sequences import _allocators
+
+from benchapp.models import Item
+
+
+@unittest.skipIf(ON_SERVER, 'runs on the pyodbc stand-in')
+class ModelNamesTest(unittest.TestCase):
+
+    def setUp(self):
+        connection.cursor()
+        self.names = model_names(Item)
+
+    def test_table_names(self):
+        self.assertTrue(table_names('benchapp_item') is self.names)
+        self.assertEqual(table_names('unknown_table'), None)
+
+    def test_has_id_col_without_query(self):
+        raw = connection.connection
+        statements = raw.statements
+        self.assertTrue(connection.ops.has_id_col('benchapp_item', None, connection.owner))
+        self.assertEqual(raw.statements, statements)
+
+    def test_sql_flush(self):
+        sql = connection.ops.sql_flush(no_style(), ['benchapp_item'], [])
+        self.assertEqual(sql, ['DELETE FROM %s;' % self.names.qtable])
+
+    def test_sequence(self):
+        # The stand-in returns no value
+        self.assertRaises(DatabaseError, connection.ops.get_autoinc_keyval,
+                          'benchapp_item', 'id', 32, connection.cursor())
+        self.assertTrue(('default', self.names.sequence) in _allocators)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+SQL of the sliced querysets, before and since OpenEdge 11.2.
+'''
+
+from setup_env import ON_SERVER
+
+import unittest
+
+from django.db import connection
+from django.db.models import Count
+from django.db.utils import DatabaseError
+
+from benchapp.models import Item
+
+PK = '"benchapp_item"."id"'
+
+
+@unittest.skipIf(ON_SERVER, 'runs on the pyodbc stand-in')
+class PagingTest(unittest.TestCase):
+    version = None
+
+    def setUp(self):
+        self.saved = connection.ops._oe_version
+        connection.ops._oe_version = self.version
+        # The compiled SQL depends on the version
+        connection.compiled_cache.clear()
+
+    def tearDown(self):
+        connection.ops._oe_version = self.saved
+        connection.compiled_cache.clear()
+
+    def sql(self, queryset):
+        return queryset.query.get_compiler(connection=connection).as_sql()[0]
+
+
+class SkipByKeyTest(PagingTest):
+    version = (10, 2)
+
+    def test_pk_breaks_the_ties(self):
+        sql = self.sql(Item.objects.order_by('-name')[10:20])
+        ordering = 'ORDER BY "benchapp_item"."name" DESC, %s' % PK
+        self.assertEqual(sql.count(ordering), 2)
+        self.assertTrue('NOT IN (SELECT TOP 10 %s' % PK in sql)
+
+    def test_pk_ordering_kept(self):
+        sql = self.sql(Item.objects.order_by('-id')[10:20])
+        self.assertEqual(sql.count('ORDER BY %s DESC)' % PK), 1)
+        self.assertTrue(sql.endswith('ORDER BY %s DESC' % PK))
+
+    def test_grouped_offset_refused(self):
+        queryset = Item.objects.values('name').annotate(n=Count('id'))[10:12]
+        self.assertRaises(DatabaseError, self.sql, queryset)
+
+    def test_subquery(self):
+        sql = self.sql(Item.objects.filter(pk__in=Item.objects.order_by('name')[10:20].values('pk')))
+        self.assertTrue('IN (SELECT TOP 10 U0."id" FROM "benchapp_item" U0 WHERE U0."id" NOT IN' in sql)
+
+
+class OffsetFetchTest(PagingTest):
+    version = (11, 2)
+
+    def test_pk_breaks_the_ties(self):
+        sql = self.sql(Item.objects.order_by('-name')[10:20])
+        self.assertTrue(sql.endswith('ORDER BY "benchapp_item"."name" DESC, %s '
+                                     'OFFSET 10 ROWS FETCH NEXT 10 ROWS ONLY' % PK))
+
+
+if __name__ == '__main__':
+    unittest.main()
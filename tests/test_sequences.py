@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Block allocation of the id sequences.
+'''
+
+from setup_env import CONNSTR, ON_SERVER
+
+import unittest
+
+from django.core.management.color import no_style
+from django.db import connection
+
+from OpenEdge.pyodbc.sequences import ROW_SOURCE, SequenceAllocator, get_allocator, invalidate_allocators
+
+from benchapp.models import Item
+
+SEQUENCE = 'id_benchapp_item'
+COUNT = 50
+
+
+class SequenceCursor(object):
+    """
+    Cursor answering the NEXTVAL statements with the next values.
+    """
+    def __init__(self):
+        self.last = 0
+        self.rows = []
+
+    def execute(self, sql):
+        count = sql.startswith('SELECT TOP') and int(sql.split()[2]) or 1
+        self.rows = [(self.last + i + 1,) for i in xrange(count)]
+        self.last += count
+
+    def fetchall(self):
+        return self.rows
+
+
+@unittest.skipIf(ON_SERVER, 'runs on the pyodbc stand-in')
+class InvalidationTest(unittest.TestCase):
+
+    def setUp(self):
+        invalidate_allocators('default')
+
+    def kept_allocator(self):
+        allocator = get_allocator('default', SEQUENCE)
+        allocator.allocate(1, SequenceCursor(), 10)
+        self.assertEqual(allocator.stats()['kept'], 9)
+        return allocator
+
+    def assertDropped(self, allocator):
+        self.assertEqual(allocator.stats()['kept'], 0)
+        self.assertTrue(get_allocator('default', SEQUENCE) is not allocator)
+
+    def test_drop_table(self):
+        allocator = self.kept_allocator()
+        connection.cursor().execute('DROP TABLE "benchapp_item"')
+        self.assertDropped(allocator)
+
+    def test_create_sequence(self):
+        allocator = self.kept_allocator()
+        connection.cursor().execute('CREATE SEQUENCE PUB.%s START WITH 0, INCREMENT BY 1, MINVALUE 0, NOCYCLE'
+                                    % SEQUENCE.upper())
+        self.assertDropped(allocator)
+
+    def test_other_table(self):
+        allocator = self.kept_allocator()
+        connection.cursor().execute('DROP TABLE "benchapp_other"')
+        self.assertEqual(allocator.stats()['kept'], 9)
+        self.assertTrue(get_allocator('default', SEQUENCE) is allocator)
+
+    def test_sql_flush(self):
+        allocator = self.kept_allocator()
+        connection.ops.sql_flush(no_style(), ['benchapp_item'], [])
+        self.assertDropped(allocator)
+
+    def test_sequence_reset_sql(self):
+        allocator = self.kept_allocator()
+        self.assertEqual(connection.ops.sequence_reset_sql(no_style(), [Item]), [])
+        self.assertDropped(allocator)
+
+
+@unittest.skipUnless(ON_SERVER, 'needs an OpenEdge server, see setup_env')
+class NextvalTest(unittest.TestCase):
+    """
+    The block allocation relies on NEXTVAL being evaluated for each row.
+    """
+    sequence = 'PUB.test_nextval_block'
+
+    def setUp(self):
+        import pyodbc
+        self.connection = pyodbc.connect(CONNSTR)
+        self.cursor = self.connection.cursor()
+        self.cursor.execute('CREATE SEQUENCE %s START WITH 0, INCREMENT BY 1, MINVALUE 0, NOCYCLE'
+                            % self.sequence)
+        self.connection.commit()
+
+    def tearDown(self):
+        self.cursor.execute('DROP SEQUENCE %s' % self.sequence)
+        self.connection.commit()
+        self.connection.close()
+
+    def test_top_nextval_values_are_distinct(self):
+        self.cursor.execute('SELECT TOP %d %s.NEXTVAL FROM %s' % (COUNT, self.sequence, ROW_SOURCE))
+        values = [row[0] for row in self.cursor.fetchall()]
+        self.assertEqual(len(values), COUNT)
+        self.assertEqual(len(set(values)), COUNT)
+
+    def test_allocated_values_are_distinct(self):
+        allocator = SequenceAllocator(self.sequence, 'SYSPROGRESS.SYSCALCTABLE')
+        values = allocator.allocate(COUNT, self.cursor) + allocator.allocate(1, self.cursor)
+        self.assertEqual(len(set(values)), COUNT + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
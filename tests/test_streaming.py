@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Streaming reads with CHUNKED_READS.
+'''
+
+from setup_env import ON_SERVER
+
+import unittest
+
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+from OpenEdge.pyodbc.streaming import stream
+
+from benchapp.models import Item
+
+
+@unittest.skipIf(ON_SERVER, 'runs on the pyodbc stand-in')
+class StreamTest(unittest.TestCase):
+
+    def setUp(self):
+        connection.cursor()
+        self.thread_connection = connection.connection
+        self.created = []
+        connection_created.connect(self.receiver)
+        self.saved = connection.features.can_use_chunked_reads
+        connection.features.can_use_chunked_reads = True
+
+    def tearDown(self):
+        connection.features.can_use_chunked_reads = self.saved
+        connection_created.disconnect(self.receiver)
+        connection.close()
+
+    def receiver(self, sender, connection, **kwargs):
+        self.created.append(connection.connection)
+
+    def test_list_on_thread_connection(self):
+        list(Item.objects.all())
+        self.assertEqual(self.created, [])
+        self.assertEqual(connection._stream_connections, [])
+
+    def test_stream_on_dedicated_connection(self):
+        list(stream(Item.objects.all()))
+        self.assertEqual(len(self.created), 1)
+        self.assertTrue(self.created[0] is not self.thread_connection)
+        self.assertTrue(connection.connection is self.thread_connection)
+        # The dedicated connection is reused
+        list(stream(Item.objects.all()))
+        self.assertEqual(len(self.created), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
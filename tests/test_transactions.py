@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+'''
+Created on 18 oct. 2026
+
+@author: jyp
+
+Commits of the writes, on the pyodbc stand-in.
+'''
+
+from setup_env import ON_SERVER
+
+import unittest
+
+from django.db import connection, transaction
+
+from benchapp.models import Item
+
+INSERT = 'INSERT INTO "benchapp_item" ("name", "qty") VALUES (%s, %s)'
+
+
+@unittest.skipIf(ON_SERVER, 'runs on the pyodbc stand-in')
+class ExecutemanyIterTest(unittest.TestCase):
+
+    def test_managed_block_is_committed(self):
+        connection.cursor()
+        raw = connection.connection
+        commits = raw.commits
+        with transaction.commit_on_success():
+            cursor = connection.cursor()
+            count = cursor.executemany_iter(INSERT, ((u'n%d' % i, i) for i in xrange(10)), batch_size=4)
+        self.assertEqual(count, 10)
+        self.assertEqual(raw.commits, commits + 1)
+        self.assertFalse(connection.is_dirty())
+
+
+@unittest.skipIf(ON_SERVER, 'runs on the pyodbc stand-in')
+class CommitModeTest(unittest.TestCase):
+
+    def update_commits(self, mode):
+        connection.cursor()
+        raw = connection.connection
+        commits = raw.commits
+        connection.commit_mode = mode
+        try:
+            Item.objects.filter(pk=7).update(qty=2)
+        finally:
+            connection.commit_mode = 'transaction'
+        return raw.commits - commits
+
+    def test_update_is_committed_once(self):
+        self.assertEqual(self.update_commits('transaction'), 1)
+
+    def test_statement_mode_commits_each_statement(self):
+        self.assertTrue(self.update_commits('statement') > 1)
+
+
+if __name__ == '__main__':
+    unittest.main()